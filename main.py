@@ -3,13 +3,17 @@ import logging
 import os
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from src.config import SYMBOLS
+from src.config import LIVE_FEED, LIVE_FEED_RESTART_SECONDS, RUN_DEADLINE_SECONDS, SYMBOLS
+from src.correlation_engine import correlation_pairs
 from src.data_engine import MarketData
+from src.live_feed import make_feed
 from src.analysis_engine import LocalAnalyst
 from src.cot_data import COTAnalyzer
 from src.economic_calendar import EconomicCalendar
+from src.executors import executor_metrics, shutdown_executors
 from src.llm_synthesis import ReasoningCore
 from src.messenger import DiscordBot
+from src.resilience import run_deadline
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,6 +32,9 @@ ET_TZ = ZoneInfo("America/New_York")
 TARGET_HOUR = 5
 TARGET_MINUTE = 0
 
+# Strong references to background tasks (the event loop only keeps weak ones)
+_background_tasks = set()
+
 
 def get_seconds_until_target(target_hour: int = TARGET_HOUR, target_minute: int = TARGET_MINUTE) -> float:
     """Calculate seconds until the next valid trading day at target time (05:00 ET)."""
@@ -51,15 +58,15 @@ def get_seconds_until_target(target_hour: int = TARGET_HOUR, target_minute: int
     return seconds_until, target_time
 
 
-async def run_pipeline():
-    """Execute the full trading intelligence pipeline."""
+async def run_pipeline(data_engine: MarketData = None):
+    """Execute the full trading intelligence pipeline. A shared MarketData carries live-streamed sessions."""
     logger.info("=" * 50)
     logger.info("Starting Gold_Sovereign_AI pipeline")
     logger.info("=" * 50)
 
     try:
         # Initialize all components
-        data_engine = MarketData()
+        data_engine = data_engine if data_engine is not None else MarketData()
         analyst = LocalAnalyst()
         cot_analyzer = COTAnalyzer()
         calendar = EconomicCalendar()
@@ -81,8 +88,21 @@ async def run_pipeline():
         logger.info(f"  ✓ OHLC: O={session_data['open']} H={session_data['high']} L={session_data['low']} C={session_data['close']}")
         logger.info(f"  ✓ Bars in session: {session_data['bars_in_session']}")
 
-        # Also fetch hourly data for analysis engine (VPOC, regime)
-        gold_hourly = await data_engine.fetch_ohlcv(gold_symbol, period="5d", interval="1h")
+        # Validate the 5m bars behind the session candle before any analysis uses them
+        quality = await data_engine.check_data_quality(gold_symbol)
+        if quality["passed"]:
+            logger.info(f"  ✓ Data quality: {quality['bars']} bars, {quality.get('missing_bars', 0)} missing")
+        else:
+            logger.warning(f"  ⚠ Data quality issues: {'; '.join(quality['issues'])}")
+
+        live_session = data_engine.live_session(gold_symbol)
+        if live_session:
+            logger.info(f"  ✓ Live session {live_session['session_date']}: C={live_session['close']} VWAP={live_session['vwap']} ({live_session['bars_in_session']} bars)")
+
+        # 5m bars for the volume profile and hourly bars for the regime, from one shared download
+        analysis_start = data_engine.session_window()[0]
+        gold_bars = await data_engine.fetch_ohlcv(gold_symbol, interval="5m", start=analysis_start)
+        gold_hourly = await data_engine.fetch_resampled(gold_symbol, interval="1h", start=analysis_start)
 
         # === MATH LAYER ===
         logger.info("[2/6] Computing correlations...")
@@ -92,6 +112,11 @@ async def run_pipeline():
         else:
             logger.info(f"  ⚠ Correlations unavailable")
 
+        multi_horizon = await data_engine.get_multi_horizon_correlations()
+        horizon_correlations = correlation_pairs(multi_horizon) if multi_horizon else {}
+        if horizon_correlations:
+            logger.info(f"  ✓ Return correlations across {len(horizon_correlations)} horizons")
+
         # === POSITIONING LAYER (moved up for event detection) ===
         logger.info("[3/6] Fetching COT positioning & calendar...")
         cot_positioning = await cot_analyzer.get_gold_positioning()
@@ -109,25 +134,34 @@ async def run_pipeline():
 
         # === VOLATILITY LAYER (uses event context for K-Factor) ===
         logger.info("[4/6] Calculating volatility levels...")
-        volatility_levels = data_engine.calc_volatility_levels(session_data, event_context)
+        session_atr = await data_engine.get_session_atr(gold_symbol)
+        volatility_levels = data_engine.calc_volatility_levels(session_data, event_context, session_atr)
         logger.info(f"  ✓ Regime: {volatility_levels.get('regime', 'NORMAL')}")
         logger.info(f"  ✓ Pivot: {volatility_levels.get('pivot', 'N/A')}")
         logger.info(f"  ✓ Session Range: {volatility_levels.get('session_range', 'N/A')} pts")
+        if session_atr:
+            logger.info(f"  ✓ ATR({session_atr['period']}): SMA={session_atr['atr_sma']} Wilder={session_atr['atr_wilder']}")
+        logger.info(f"  ✓ Band source: {volatility_levels.get('volatility_source', 'session_range')}")
         if volatility_levels.get('is_event_day'):
             logger.info(f"  🚨 K-Factor Applied: {volatility_levels.get('k_factor')}x")
 
         # === ANALYSIS LAYER ===
         logger.info("[5/6] Analyzing market structure...")
         if gold_hourly is not None and not gold_hourly.empty:
-            market_structure = analyst.analyze_market_structure(gold_hourly)
+            market_structure = analyst.analyze_market_structure(gold_bars if gold_bars is not None else gold_hourly)
             market_regime = analyst.get_market_regime(gold_hourly)
             logger.info(f"  ✓ Structure Regime: {market_regime}")
             logger.info(f"  ✓ VPOC: {market_structure.get('vpoc', 'N/A')}")
+            logger.info(f"  ✓ Value Area: {market_structure.get('vah', 'N/A')} - {market_structure.get('val', 'N/A')}")
         else:
             market_structure = {"vpoc": session_data.get("vwap")}
             market_regime = "Unknown"
             logger.info(f"  ⚠ Using VWAP as VPOC proxy: {session_data.get('vwap')}")
 
+        composite_profiles = await data_engine.get_composite_profiles(gold_symbol)
+        for name, composite in composite_profiles.items():
+            logger.info(f"  ✓ Composite {name}: VPOC={composite['vpoc']} VA={composite['vah']} - {composite['val']} ({composite['sessions']} sessions)")
+
         # === BUILD DATA PACKAGE ===
         market_data_dict = {
             "timestamp": datetime.now(ET_TZ).strftime("%Y-%m-%d %H:%M ET"),
@@ -143,20 +177,26 @@ async def run_pipeline():
                 "session_start": session_data["session_start"],
                 "session_end": session_data["session_end"]
             },
-            "current_price": session_data["close"],
+            "live_session": live_session,
+            "current_price": live_session["close"] if live_session else session_data["close"],
             "correlations": correlation_matrix.to_dict() if not correlation_matrix.empty else {},
+            "return_correlations": horizon_correlations,
             "volatility_levels": volatility_levels,
             "market_structure": {
                 "vpoc": market_structure.get("vpoc"),
                 "max_volume_node": market_structure.get("max_volume"),
+                "vah": market_structure.get("vah"),
+                "val": market_structure.get("val"),
+                "composite_profiles": composite_profiles,
                 "regime": market_regime
             },
             "cot_positioning": cot_positioning,
             "event_calendar": event_context,
             "data_quality": {
                 "bars_in_session": session_data["bars_in_session"],
-                "data_source": "Yahoo Finance (CME Session Aligned)",
-                "session_alignment": "18:00 ET to 17:00 ET"
+                "data_source": f"{data_engine.provider.name} (CME Session Aligned)",
+                "session_alignment": "18:00 ET to 17:00 ET",
+                "validation": quality
             }
         }
 
@@ -164,6 +204,7 @@ async def run_pipeline():
         logger.info("[6/6] Generating LLM report...")
         report = await llm.generate_report(market_data_dict)
         logger.info(f"  ✓ Report generated ({len(report)} chars)")
+        logger.info(f"  ✓ Executors: {executor_metrics()}")
 
         # === DELIVERY ===
         logger.info("Sending report to Discord...")
@@ -183,12 +224,39 @@ async def run_pipeline():
         return False
 
 
+def start_live_feed(data_engine: MarketData) -> asyncio.Task:
+    """Stream LIVE_FEED into data_engine; if the stream dies, log why and restart it after a delay."""
+    task = asyncio.create_task(data_engine.stream_bars(SYMBOLS["gold"], make_feed(LIVE_FEED)))
+    _background_tasks.add(task)
+
+    def _on_done(done: asyncio.Task):
+        _background_tasks.discard(done)
+        if done.cancelled():
+            return
+        error = done.exception()
+        if error is not None:
+            logger.error(f"❌ Live feed failed: {error!r}", exc_info=error)
+        else:
+            logger.warning("⚠ Live feed ended")
+        logger.info(f"📡 Restarting live feed in {LIVE_FEED_RESTART_SECONDS}s...")
+        asyncio.get_running_loop().call_later(LIVE_FEED_RESTART_SECONDS, start_live_feed, data_engine)
+
+    task.add_done_callback(_on_done)
+    return task
+
+
 async def daily_scheduler():
     """Run the pipeline once daily at 05:00 ET (Pre-Market Brief) on trading days only."""
     logger.info("=" * 50)
     logger.info("Gold_Sovereign_AI Daily Scheduler Started")
     logger.info(f"Target execution time: {TARGET_HOUR:02d}:{TARGET_MINUTE:02d} ET (Sun-Fri, skip Saturday)")
     logger.info("=" * 50)
+
+    # One long-lived MarketData keeps the live session accumulators between runs
+    data_engine = MarketData()
+    if LIVE_FEED:
+        logger.info(f"📡 Live feed enabled: {LIVE_FEED}")
+        start_live_feed(data_engine)
     
     while True:
         try:
@@ -205,7 +273,9 @@ async def daily_scheduler():
             # Execute the pipeline
             logger.info("⏰ Wake up! Executing Pre-Market Brief...")
             try:
-                await run_pipeline()
+                # Retries across every source share one budget so a dead upstream cannot eat the pre-market window
+                with run_deadline(RUN_DEADLINE_SECONDS):
+                    await run_pipeline(data_engine)
             except Exception as e:
                 logger.error(f"❌ Pipeline execution failed: {e}", exc_info=True)
                 logger.info("Pipeline failed but scheduler will continue. Sleeping until tomorrow...")
@@ -226,11 +296,15 @@ async def main():
     if run_once:
         # Single execution mode (for testing)
         logger.info("Running in single execution mode (RUN_ONCE=true)")
-        await run_pipeline()
+        with run_deadline(RUN_DEADLINE_SECONDS):
+            await run_pipeline()
     else:
         # Daily scheduled mode (production)
         await daily_scheduler()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    finally:
+        shutdown_executors()
@@ -1,42 +1,121 @@
 import logging
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
+from src.config import PROFILE_TICK_SIZE, VOLUME_PROFILE_MODE
+from src.volume_profile import histogram_profile, tick_profile
 
 logger = logging.getLogger(__name__)
 
 
+def _bar_column(bars, column: str) -> pd.Series:
+    """Column of a DataFrame or BarColumns as a Series; NumPy views are wrapped without copying."""
+    values = bars[column]
+    return values if isinstance(values, pd.Series) else pd.Series(values, copy=False)
+
+
+# Smoothing methods supported by atr_frame
+ATR_METHODS = ("sma", "wilder", "ema")
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    True range per bar: the widest of high-low and the gaps from the previous close.
+    The first bar has no previous close, so its range is high-low.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    prev_close = np.asarray(close, dtype=np.float64)[:-1]
+
+    tr = high - low
+    if len(tr) > 1:
+        tr[1:] = np.maximum.reduce([tr[1:], np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)])
+    return tr
+
+
+def _sma(cumulative: np.ndarray, period: int) -> np.ndarray:
+    """Rolling mean from a zero-prefixed cumulative sum; NaN until `period` values exist."""
+    out = np.full(len(cumulative) - 1, np.nan)
+    if len(out) >= period:
+        out[period - 1:] = (cumulative[period:] - cumulative[:-period]) / period
+    return out
+
+
+def _seeded_average(tr: np.ndarray, seed: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """
+    Recursive average y[t] = y[t-1] + alpha * (tr[t] - y[t-1]), seeded with the simple
+    average of the first `period` ranges (Wilder's convention); NaN before the seed.
+    """
+    out = np.full(len(tr), np.nan)
+    if len(tr) >= period:
+        values = np.concatenate(([seed[period - 1]], tr[period:]))
+        out[period - 1:] = pd.Series(values, copy=False).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+
+def atr_frame(bars, periods: Iterable[int] = (14,), methods: Iterable[str] = ATR_METHODS) -> pd.DataFrame:
+    """
+    True range plus SMA, Wilder (alpha 1/N) and EMA (alpha 2/(N+1)) ATR for every
+    period, as full series aligned with `bars` (a DataFrame or BarColumns view).
+    Columns are `tr` and `atr_{method}_{period}`. One cumulative sum of the ranges
+    serves every SMA; the recursive averages run in pandas' compiled ewm.
+    """
+    tr = true_range(bars["high"], bars["low"], bars["close"])
+    cumulative = np.concatenate(([0.0], np.cumsum(tr)))
+    index = bars.index if isinstance(bars, pd.DataFrame) else None
+
+    columns = {"tr": tr}
+    for period in periods:
+        sma = _sma(cumulative, period)
+        if "sma" in methods:
+            columns[f"atr_sma_{period}"] = sma
+        if "wilder" in methods:
+            columns[f"atr_wilder_{period}"] = _seeded_average(tr, sma, period, 1.0 / period)
+        if "ema" in methods:
+            columns[f"atr_ema_{period}"] = _seeded_average(tr, sma, period, 2.0 / (period + 1))
+    return pd.DataFrame(columns, index=index)
+
+
 class LocalAnalyst:
     def __init__(self):
         pass
 
-    def analyze_market_structure(self, df: pd.DataFrame, bins: int = 50) -> Dict[str, float]:
-        """Identify VPOC (Volume Point of Control) via volume profile histogram."""
+    def analyze_market_structure(self, df: pd.DataFrame, bins: int = 50, mode: str = VOLUME_PROFILE_MODE,
+                                 tick_size: float = PROFILE_TICK_SIZE) -> Dict:
+        """
+        Identify VPOC (Volume Point of Control) and the value area (VAH/VAL) via volume profile histogram.
+        Accepts a DataFrame or a BarColumns view (e.g. MarketData.load_bar_columns(...).session(date)).
+        mode "tick" spreads each bar's volume over its high-low range at `tick_size` resolution;
+        "close" puts it at the close in `bins` equal-width bins.
+        The input is left untouched; the full VolumeProfile is returned under "profile".
+        """
         if df.empty or "volume" not in df.columns or "close" not in df.columns:
             logger.warning("Insufficient data for VPOC analysis")
             return {"vpoc": None}
 
-        price_min = df["close"].min()
-        price_max = df["close"].max()
-        
-        if price_min == price_max:
-            logger.warning("No price variation for VPOC calculation")
-            return {"vpoc": float(price_min)}
+        if mode == "tick":
+            has_range = "high" in df.columns and "low" in df.columns
+            high = df["high"] if has_range else df["close"]
+            low = df["low"] if has_range else df["close"]
+            profile = tick_profile(high, low, df["volume"], tick_size)
+        else:
+            profile = histogram_profile(df["close"], df["volume"], bins=bins)
 
-        price_bins = np.linspace(price_min, price_max, bins + 1)
-        df["price_bin"] = pd.cut(df["close"], bins=price_bins, include_lowest=True)
-        
-        volume_profile = df.groupby("price_bin", observed=True)["volume"].sum()
-        
-        if volume_profile.empty:
-            return {"vpoc": float(df["close"].iloc[-1])}
+        if len(profile) == 0:
+            logger.warning("No prices for VPOC analysis")
+            return {"vpoc": None}
 
-        vpoc_bin = volume_profile.idxmax()
-        vpoc_price = vpoc_bin.mid if hasattr(vpoc_bin, 'mid') else float(vpoc_bin.left + vpoc_bin.right) / 2
+        if profile.bin_size == 0:
+            logger.warning("No price variation for VPOC calculation")
+            return {"vpoc": profile.low}
 
+        val, vah = profile.value_area()
         return {
-            "vpoc": float(vpoc_price),
-            "max_volume": float(volume_profile.max())
+            "vpoc": profile.vpoc,
+            "max_volume": profile.max_volume,
+            "vah": vah,
+            "val": val,
+            "profile": profile
         }
 
     def get_market_regime(self, df: pd.DataFrame, period: int = 20) -> str:
@@ -49,23 +128,17 @@ class LocalAnalyst:
             logger.warning("Missing required columns for regime analysis")
             return "Unknown"
 
-        close = df["close"]
-        high = df["high"]
-        low = df["low"]
-
-        atr_values = []
-        for i in range(period, len(df)):
-            tr1 = high.iloc[i] - low.iloc[i]
-            tr2 = abs(high.iloc[i] - close.iloc[i-1])
-            tr3 = abs(low.iloc[i] - close.iloc[i-1])
-            atr = max(tr1, tr2, tr3)
-            atr_values.append(atr)
+        close = _bar_column(df, "close")
+        high = _bar_column(df, "high").to_numpy()
+        low = _bar_column(df, "low").to_numpy()
 
-        if not atr_values:
+        # True range of every bar that has a previous close
+        tr = true_range(high, low, close)[1:]
+        if len(tr) == 0:
             return "Unknown"
 
-        atr = np.mean(atr_values)
-        current_atr = atr_values[-1] if atr_values else atr
+        atr = float(tr.mean())
+        current_atr = float(tr[-1])
 
         sma = close.rolling(window=period).mean()
         std = close.rolling(window=period).std()
@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+import pandas as pd
+from src.config import BACKFILL_CONCURRENCY, SYMBOLS
+from src.data_engine import MarketData, normalize_bars
+from src.executors import run_io
+from src.fetch_scheduler import FetchScheduler, fetch_priority
+from src.providers import Chunk
+from src.resilience import retry_on_failure
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "backfill_checkpoint.json"
+
+# Chunk span for intervals the provider does not limit (e.g. daily bars)
+DEFAULT_CHUNK_SPAN = timedelta(days=365)
+
+
+
+class HistoricalBackfill:
+    """
+    Resumable bulk history download into the MarketData bar store.
+    The date range is split into provider-sized chunks that are fetched
+    concurrently through a FetchScheduler (bounded by `max_concurrency` and the
+    provider's rate limit, gold first). Each finished chunk is recorded
+    in a checkpoint file next to the store, so a rerun with the same arguments
+    skips work that already completed.
+    """
+
+    def __init__(self, market_data: Optional[MarketData] = None, max_concurrency: int = BACKFILL_CONCURRENCY,
+                 checkpoint_path: Optional[str] = None):
+        self.market_data = market_data if market_data is not None else MarketData()
+        self.provider = self.market_data.provider
+        self.store = self.market_data.store
+        self.scheduler = FetchScheduler(max_concurrency)
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else self.store.root / CHECKPOINT_FILE
+        self._completed: Dict[str, Set[str]] = self._load_checkpoint()
+        self._symbol_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    def _load_checkpoint(self) -> Dict[str, Set[str]]:
+        if not self.checkpoint_path.exists():
+            return {}
+        try:
+            raw = json.loads(self.checkpoint_path.read_text())
+            return {job: set(chunks) for job, chunks in raw.items()}
+        except Exception as e:
+            logger.warning(f"Backfill checkpoint {self.checkpoint_path} unreadable ({e}) - starting fresh")
+            return {}
+
+    def _save_checkpoint(self):
+        """Persist completed chunks atomically."""
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({job: sorted(chunks) for job, chunks in self._completed.items()}, indent=1))
+        os.replace(tmp_path, self.checkpoint_path)
+
+    @staticmethod
+    def _job_key(symbol: str, interval: str) -> str:
+        return f"{symbol}|{interval}"
+
+    @staticmethod
+    def _chunk_key(chunk: Chunk) -> str:
+        return f"{chunk[0].isoformat()}/{chunk[1].isoformat()}"
+
+    def plan_chunks(self, interval: str, start: pd.Timestamp, end: pd.Timestamp) -> List[Chunk]:
+        """Split [start, end) into spans the provider accepts, clipped to the history it serves."""
+        return self.provider.clip_history(interval, start, end, default_span=DEFAULT_CHUNK_SPAN)
+
+    @retry_on_failure(max_retries=3, delay=2.0, source=lambda self, *args, **kwargs: self.provider.name)
+    async def _download_chunk(self, symbol: str, interval: str, chunk: Chunk) -> Optional[pd.DataFrame]:
+        async with self.scheduler.slot(self.provider, fetch_priority([symbol])):
+            frames = await run_io(
+                self.provider.download, [symbol], interval,
+                start=chunk[0].to_pydatetime(), end=chunk[1].to_pydatetime()
+            )
+        return normalize_bars(frames.get(symbol))
+
+    async def _run_chunk(self, symbol: str, interval: str, chunk: Chunk) -> int:
+        """Download one chunk, merge it into the store and checkpoint it. Returns bars received."""
+        bars = await self._download_chunk(symbol, interval, chunk)
+
+        # Appends to one symbol's store must not interleave
+        lock = self._symbol_locks.setdefault((symbol, interval), asyncio.Lock())
+        async with lock:
+            if bars is not None and not bars.empty:
+                await run_io(self.store.append, symbol, interval, bars)
+            self._completed.setdefault(self._job_key(symbol, interval), set()).add(self._chunk_key(chunk))
+            self._save_checkpoint()
+
+        count = 0 if bars is None else len(bars)
+        logger.info(f"Backfill {symbol} {interval} {chunk[0]:%Y-%m-%d} → {chunk[1]:%Y-%m-%d}: {count} bars")
+        return count
+
+    async def run(self, symbols: List[str], interval: str, start: str, end: Optional[str] = None) -> Dict[str, Dict]:
+        """Backfill every symbol over [start, end); returns per-symbol chunk and bar counts."""
+        start_ts = pd.Timestamp(start, tz="UTC")
+        end_ts = pd.Timestamp(end, tz="UTC") if end else self.provider.now().ceil("D")
+        chunks = self.plan_chunks(interval, start_ts, end_ts)
+
+        summary = {}
+        jobs = []
+        for symbol in symbols:
+            done = self._completed.get(self._job_key(symbol, interval), set())
+            todo = [chunk for chunk in chunks if self._chunk_key(chunk) not in done]
+            summary[symbol] = {"chunks": len(chunks), "skipped": len(chunks) - len(todo), "failed": 0, "bars": 0}
+            jobs.extend((symbol, chunk) for chunk in todo)
+
+        logger.info(f"Backfill {interval}: {len(jobs)} chunks to fetch, "
+                    f"{sum(s['skipped'] for s in summary.values())} already done")
+
+        results = await asyncio.gather(
+            *(self._run_chunk(symbol, interval, chunk) for symbol, chunk in jobs),
+            return_exceptions=True
+        )
+
+        for (symbol, chunk), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                logger.error(f"Backfill chunk failed {symbol} {interval} {self._chunk_key(chunk)}: {result}")
+                summary[symbol]["failed"] += 1
+            else:
+                summary[symbol]["bars"] += result
+
+        return summary
+
+
+async def _main(args: argparse.Namespace):
+    backfill = HistoricalBackfill(max_concurrency=args.concurrency)
+    for interval in args.intervals:
+        summary = await backfill.run(args.symbols, interval, args.start, args.end)
+        for symbol, stats in summary.items():
+            logger.info(f"✓ {symbol} {interval}: {stats['bars']} bars, {stats['chunks']} chunks "
+                        f"({stats['skipped']} resumed, {stats['failed']} failed)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Resumable bulk historical backfill into the local bar store")
+    parser.add_argument("--symbols", nargs="+", default=list(SYMBOLS.values()))
+    parser.add_argument("--intervals", nargs="+", default=["1h"])
+    parser.add_argument("--start", required=True, help="First date to fetch (YYYY-MM-DD, UTC)")
+    parser.add_argument("--end", default=None, help="End date, exclusive (default: now)")
+    parser.add_argument("--concurrency", type=int, default=BACKFILL_CONCURRENCY)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,294 @@
+import io
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.config import BAR_STORE_DIR
+from src.session_calendar import DateLike, SessionIndex
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+TIMESTAMP_FILE = "timestamp.npy"
+
+
+def safe_name(name: str) -> str:
+    """Filesystem-safe form of a symbol or column name (e.g. GC=F -> GC_F, ^TNX -> TNX)."""
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(name)).strip("_")
+
+
+class BarColumns:
+    """
+    Zero-copy columnar view of stored bars.
+    Columns are NumPy arrays (memory-mapped when loaded from the store); `window`
+    and `session` return new BarColumns whose arrays are views, never copies.
+    Supports the small DataFrame surface the analysis layer needs:
+    `bars["close"]`, `bars.columns`, `bars.empty` and `len(bars)`.
+    """
+
+    def __init__(self, timestamps: np.ndarray, data: Dict[str, np.ndarray],
+                 session_index: Optional[SessionIndex] = None):
+        self.timestamps = timestamps  # int64 UTC nanoseconds
+        self._data = data
+        self._session_index = session_index
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self._data[column]
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._data)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.timestamps) == 0
+
+    @property
+    def first_timestamp(self) -> pd.Timestamp:
+        return pd.Timestamp(int(self.timestamps[0]), tz="UTC")
+
+    @property
+    def last_timestamp(self) -> pd.Timestamp:
+        return pd.Timestamp(int(self.timestamps[-1]), tz="UTC")
+
+    def _slice(self, positions: slice) -> "BarColumns":
+        return BarColumns(self.timestamps[positions], {name: col[positions] for name, col in self._data.items()})
+
+    def window(self, start: pd.Timestamp, end: pd.Timestamp) -> "BarColumns":
+        """Bars with start <= timestamp <= end, found by binary search."""
+        lo = int(np.searchsorted(self.timestamps, pd.Timestamp(start).value, side="left"))
+        hi = int(np.searchsorted(self.timestamps, pd.Timestamp(end).value, side="right"))
+        return self._slice(slice(lo, hi))
+
+    def session(self, session_date: DateLike) -> "BarColumns":
+        """Bars of the CME session ending on `session_date`."""
+        if self._session_index is None:
+            self._session_index = SessionIndex(self.timestamps)
+        return self._slice(self._session_index.session_slice(session_date))
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize as a DataFrame on a UTC index (copies the data)."""
+        index = pd.DatetimeIndex(np.asarray(self.timestamps).view("datetime64[ns]")).tz_localize("UTC")
+        index.name = "timestamp"
+        return pd.DataFrame({name: np.asarray(col) for name, col in self._data.items()}, index=index)
+
+
+class BarStore:
+    """
+    Persistent on-disk bar store, one directory per symbol and interval.
+    Each column is a separate .npy file (timestamps as int64 ns, values in their
+    frame dtype) so the store can be memory-mapped column by column, and bars
+    newer than the stored ones are appended to the files in place.
+    """
+
+    def __init__(self, root: str = BAR_STORE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, symbol: str, interval: str) -> Path:
+        """Build a filesystem-safe directory for a symbol/interval pair (e.g. GC=F -> GC_F_5m)."""
+        return self.root / f"{safe_name(symbol)}_{interval}"
+
+    def _read_meta(self, path: Path) -> Optional[Dict]:
+        meta_path = path / META_FILE
+        if not meta_path.exists():
+            return None
+        try:
+            return json.loads(meta_path.read_text())
+        except Exception as e:
+            logger.warning(f"Bar store metadata {meta_path} unreadable ({e}) - ignoring")
+            return None
+
+    def load_columns(self, symbol: str, interval: str) -> Optional[BarColumns]:
+        """Memory-map all stored columns for a symbol/interval, or None if nothing usable is stored."""
+        path = self._path(symbol, interval)
+        meta = self._read_meta(path)
+        if meta is None or meta["rows"] == 0:
+            return None
+
+        try:
+            timestamps = np.load(path / TIMESTAMP_FILE, mmap_mode="r")
+            data = {col["name"]: np.load(path / col["file"], mmap_mode="r") for col in meta["columns"]}
+        except Exception as e:
+            logger.warning(f"Bar store {path} unreadable ({e}) - ignoring")
+            return None
+
+        # A crash between column writes leaves lengths disagreeing with the metadata
+        if any(len(arr) != meta["rows"] for arr in [timestamps, *data.values()]):
+            logger.warning(f"Bar store {path} is inconsistent - ignoring")
+            return None
+
+        return BarColumns(timestamps, data)
+
+    def load(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """Load all stored bars for a symbol/interval as a DataFrame, or None if nothing is stored."""
+        meta = self._read_meta(self._path(symbol, interval))
+        bars = self.load_columns(symbol, interval)
+        if bars is None:
+            return None
+        return self._frame(bars, meta)
+
+    @staticmethod
+    def _frame(bars: BarColumns, meta: Dict) -> pd.DataFrame:
+        """Materialize stored columns as a DataFrame with the index and column timezones in `meta`."""
+        index = pd.DatetimeIndex(np.asarray(bars.timestamps).view("datetime64[ns]"))
+        if meta.get("index_tz"):
+            index = index.tz_localize("UTC").tz_convert(meta["index_tz"])
+        index.name = meta.get("index_name")
+
+        columns = {}
+        for col in meta["columns"]:
+            values = np.asarray(bars[col["name"]])
+            if col.get("tz"):
+                values = pd.DatetimeIndex(values.view("datetime64[ns]")).tz_localize("UTC").tz_convert(col["tz"])
+            columns[col["name"]] = values
+
+        return pd.DataFrame(columns, index=index)
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        """Return the timestamp of the newest stored bar."""
+        bars = self.load_columns(symbol, interval)
+        if bars is None:
+            return None
+        return bars.last_timestamp
+
+    @staticmethod
+    def _encode(df: pd.DataFrame) -> Tuple[Dict, List[Tuple[str, np.ndarray]]]:
+        """(metadata without the row count, [(file name, values)]) for a frame, timestamps first."""
+        index = df.index
+        index_tz = str(index.tz) if index.tz is not None else None
+        if index_tz:
+            index = index.tz_convert("UTC")
+
+        columns = [(TIMESTAMP_FILE, index.as_unit("ns").asi8)]
+        column_meta = []
+        for name in df.columns:
+            series = df[name]
+            entry = {"name": name, "file": safe_name(name) + ".npy"}
+
+            if isinstance(series.dtype, pd.DatetimeTZDtype):
+                entry["tz"] = str(series.dt.tz)
+                values = pd.DatetimeIndex(series).tz_convert("UTC").as_unit("ns").asi8
+            elif pd.api.types.is_numeric_dtype(series.dtype):
+                values = series.to_numpy()
+            else:
+                logger.warning(f"Bar store skips non-numeric column {name!r}")
+                continue
+
+            column_meta.append(entry)
+            columns.append((entry["file"], values))
+
+        return {"index_tz": index_tz, "index_name": df.index.name, "columns": column_meta}, columns
+
+    @staticmethod
+    def _write_meta(path: Path, meta: Dict):
+        tmp_meta = path / f"{META_FILE}.tmp"
+        tmp_meta.write_text(json.dumps(meta))
+        os.replace(tmp_meta, path / META_FILE)
+
+    def _write(self, path: Path, df: pd.DataFrame):
+        """Write a frame as one .npy file per column, metadata last."""
+        path.mkdir(parents=True, exist_ok=True)
+        meta, columns = self._encode(df)
+
+        for file_name, values in columns:
+            tmp_path = path / f"{file_name}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, values)
+            os.replace(tmp_path, path / file_name)
+
+        self._write_meta(path, {"rows": len(df), **meta})
+
+    def _write_tail(self, path: Path, meta: Dict, columns: List[Tuple[str, np.ndarray]], position: int) -> bool:
+        """
+        Write rows from `position` on into the existing column files in place and grow their
+        .npy headers, metadata last. Rows before `position` are not touched. Returns False
+        (having written nothing) when a file's dtype differs or its header would change size.
+        """
+        rows = position + len(columns[0][1])
+        headers = {}
+        for file_name, values in columns:
+            with open(path / file_name, "rb") as f:
+                if np.lib.format.read_magic(f) != (1, 0):
+                    return False
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+                offset = f.tell()
+            if dtype != values.dtype or fortran_order or len(shape) != 1:
+                return False
+            header = io.BytesIO()
+            np.lib.format.write_array_header_1_0(header, {
+                "descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (rows,)
+            })
+            if header.tell() != offset:
+                return False
+            headers[file_name] = (header.getvalue(), offset)
+
+        # Data before headers: a reader racing the write sees the old row count, or a
+        # length/metadata mismatch that load_columns rejects
+        for file_name, values in columns:
+            header, offset = headers[file_name]
+            with open(path / file_name, "r+b") as f:
+                f.seek(offset + position * values.dtype.itemsize)
+                f.write(np.ascontiguousarray(values).tobytes())
+                f.seek(0)
+                f.write(header)
+
+        self._write_meta(path, {"rows": rows, **meta})
+        return True
+
+    def replace(self, symbol: str, interval: str, bars: pd.DataFrame):
+        """Overwrite the stored bars, for derived series that are rebuilt as a whole."""
+        self._write(self._path(symbol, interval), bars.sort_index())
+        logger.info(f"Bar store {symbol} {interval}: rewritten ({len(bars)} bars)")
+
+    def append(self, symbol: str, interval: str, new_bars: pd.DataFrame,
+               existing: Optional[BarColumns] = None) -> Optional[BarColumns]:
+        """
+        Merge new bars into the store and persist; returns the stored columns.
+        Overlapping timestamps are replaced by the new bars, since the last stored
+        bar may have been captured while it was still forming. Bars starting at or
+        after the last stored one with an unchanged schema are written as a tail
+        only; anything else rewrites the store from the merged frame. `existing`
+        reuses columns the caller already loaded.
+        """
+        path = self._path(symbol, interval)
+        meta = self._read_meta(path)
+        if existing is None or meta is None or len(existing) != meta["rows"]:
+            existing = self.load_columns(symbol, interval)
+
+        if new_bars is None or new_bars.empty:
+            return existing
+
+        new_bars = new_bars[~new_bars.index.duplicated(keep="last")].sort_index()
+        if existing is not None:
+            new_meta, columns = self._encode(new_bars)
+            schema = {key: meta.get(key) for key in new_meta}
+            first_new = int(columns[0][1][0])
+            if schema == new_meta and first_new >= int(existing.timestamps[-1]):
+                position = len(existing) - (first_new == int(existing.timestamps[-1]))
+                if self._write_tail(path, new_meta, columns, position):
+                    logger.info(f"Bar store {symbol} {interval}: +{position + len(new_bars) - len(existing)} bars "
+                                f"({position + len(new_bars)} total)")
+                    return self.load_columns(symbol, interval)
+
+        if existing is not None:
+            existing_bars = self._frame(existing, meta)
+            merged = pd.concat([existing_bars, new_bars])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            # The incoming schema wins, so a changed column/dtype policy also applies to history
+            merged = merged[list(new_bars.columns)].astype(new_bars.dtypes.to_dict(), errors="ignore")
+        else:
+            merged = new_bars.sort_index()
+
+        self._write(path, merged)
+
+        added = len(merged) - (len(existing) if existing is not None else 0)
+        logger.info(f"Bar store {symbol} {interval}: +{added} bars ({len(merged)} total)")
+        return self.load_columns(symbol, interval)
@@ -74,3 +74,76 @@ SYMBOLS = {
 OPENROUTER_MODEL = "x-ai/grok-4.1-fast"
 VOLATILITY_LOOKBACK = 20
 
+
+# Local OHLCV bar store (incremental Yahoo fetches append here)
+BAR_STORE_DIR = os.getenv("BAR_STORE_DIR", str(Path(__file__).resolve().parent.parent / "data" / "bars"))
+
+# Seconds a completed download is shared between MarketData callers
+FETCH_CACHE_TTL_SECONDS = float(os.getenv("FETCH_CACHE_TTL_SECONDS", "300"))
+
+# Session ATR used for sigma bands: "session_range" (last session only), "atr_sma" or "atr_wilder"
+ATR_PERIOD = int(os.getenv("ATR_PERIOD", "14"))
+VOLATILITY_SOURCE = os.getenv("VOLATILITY_SOURCE", "session_range")
+
+# Market data source: "yahoo" (live) or "replay" (offline CSV/Parquet files in REPLAY_DATA_DIR)
+MARKET_DATA_PROVIDER = os.getenv("MARKET_DATA_PROVIDER", "yahoo").lower()
+REPLAY_DATA_DIR = os.getenv("REPLAY_DATA_DIR", str(Path(__file__).resolve().parent.parent / "data" / "replay"))
+REPLAY_AS_OF = os.getenv("REPLAY_AS_OF", "")  # Replay clock (UTC); empty = newest replayed bar
+
+# Historical backfill (python -m src.backfill): concurrent chunk downloads
+BACKFILL_CONCURRENCY = int(os.getenv("BACKFILL_CONCURRENCY", "4"))
+
+# Bar frame dtype policy: price columns are stored at this precision ("float32" or "float64")
+BAR_PRICE_DTYPE = os.getenv("BAR_PRICE_DTYPE", "float32")
+
+# Optional live bar feed for streaming session aggregates: "file:<path>" or "socket:<host>:<port>"
+LIVE_FEED = os.getenv("LIVE_FEED", "")
+# A developing session whose newest bar is older than this is stale (feed stopped); a dead feed restarts after the delay
+LIVE_FEED_MAX_AGE_SECONDS = int(os.getenv("LIVE_FEED_MAX_AGE_SECONDS", "900"))
+LIVE_FEED_RESTART_SECONDS = int(os.getenv("LIVE_FEED_RESTART_SECONDS", "30"))
+
+# Aligned 1h bars in the rolling macro correlation window
+CORRELATION_WINDOW = int(os.getenv("CORRELATION_WINDOW", "120"))
+
+# Multi-horizon return correlations: bar sizes (resampled from 1h) x trading-day windows
+CORRELATION_BAR_SIZES = [s.strip() for s in os.getenv("CORRELATION_BAR_SIZES", "1h,4h,session").split(",") if s.strip()]
+CORRELATION_HORIZON_WINDOWS = [s.strip() for s in os.getenv("CORRELATION_HORIZON_WINDOWS", "5d,20d,60d").split(",") if s.strip()]
+
+# Fetch scheduling for larger symbol universes
+MAX_CONCURRENT_FETCHES = int(os.getenv("MAX_CONCURRENT_FETCHES", "4"))
+FETCH_BATCH_SIZE = int(os.getenv("FETCH_BATCH_SIZE", "10"))
+YAHOO_REQUESTS_PER_SECOND = float(os.getenv("YAHOO_REQUESTS_PER_SECOND", "2"))
+YAHOO_REQUEST_BURST = int(os.getenv("YAHOO_REQUEST_BURST", "10"))
+
+# Data-quality thresholds (bars are judged against the CME Globex schedule)
+DQ_MAX_MISSING_RATIO = float(os.getenv("DQ_MAX_MISSING_RATIO", "0.05"))
+DQ_STALE_RUN_BARS = int(os.getenv("DQ_STALE_RUN_BARS", "6"))
+DQ_ZERO_VOLUME_RUN_BARS = int(os.getenv("DQ_ZERO_VOLUME_RUN_BARS", "12"))
+DQ_OUTLIER_MAD_Z = float(os.getenv("DQ_OUTLIER_MAD_Z", "10"))
+DQ_MAX_OUTLIERS = int(os.getenv("DQ_MAX_OUTLIERS", "3"))
+
+# Resilience: retry backoff cap, per-source circuit breakers and the pipeline run deadline
+RETRY_MAX_DELAY_SECONDS = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "30"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "300"))
+RUN_DEADLINE_SECONDS = float(os.getenv("RUN_DEADLINE_SECONDS", "900"))
+
+# Executor sizing: threads for network/disk calls, processes for CPU-heavy analytics
+IO_WORKERS = int(os.getenv("IO_WORKERS", "8"))
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) - 1)))))
+
+# Back-adjusted continuous GC contract for long-lookback analytics (ATR bootstrap, multi-horizon correlations)
+USE_CONTINUOUS_CONTRACT = os.getenv("USE_CONTINUOUS_CONTRACT", "false").lower() == "true"
+
+# Completed CME sessions (plus the developing one) fetched for intraday analysis and correlations
+ANALYSIS_SESSIONS = int(os.getenv("ANALYSIS_SESSIONS", "5"))
+
+# Share of profile volume inside the value area (VAH/VAL) around the VPOC
+VALUE_AREA_FRACTION = float(os.getenv("VALUE_AREA_FRACTION", "0.70"))
+
+# Volume profile: "tick" spreads each bar's volume over its high-low range in PROFILE_TICK_SIZE steps, "close" bins volume at the close
+VOLUME_PROFILE_MODE = os.getenv("VOLUME_PROFILE_MODE", "tick")
+PROFILE_TICK_SIZE = float(os.getenv("PROFILE_TICK_SIZE", "0.10"))
+
+# Composite volume profiles over the last N completed sessions, merged from per-session histograms kept beside the bar store
+COMPOSITE_PROFILE_SESSIONS = [int(n) for n in os.getenv("COMPOSITE_PROFILE_SESSIONS", "20,60").split(",") if n.strip()]
@@ -0,0 +1,113 @@
+import logging
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from src.session_calendar import session_bounds, session_labels
+
+logger = logging.getLogger(__name__)
+
+# COMEX gold trades actively in Feb, Apr, Jun, Aug, Oct and Dec
+GC_CONTRACT_MONTHS = {2: "G", 4: "J", 6: "M", 8: "Q", 10: "V", 12: "Z"}
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+
+def contract_symbols(start: pd.Timestamp, end: pd.Timestamp, root: str = "GC", exchange: str = "CMX",
+                     months: Dict[int, str] = GC_CONTRACT_MONTHS) -> List[str]:
+    """
+    Yahoo tickers (e.g. GCZ25.CMX) of every active contract that can be front month
+    between `start` and `end`, ordered by expiry. Contracts run past `end` so a roll
+    near the end of the range has somewhere to go.
+    """
+    symbols = []
+    month = pd.Period(start, freq="M")
+    last = pd.Period(end, freq="M") + 2
+    while True:
+        if month.month in months:
+            symbols.append(f"{root}{months[month.month]}{month.year % 100:02d}.{exchange}")
+            if month > last:
+                break
+        month += 1
+    return symbols
+
+
+def _roll_schedule(frames: List[pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pick the front contract per CME session: the one with the most volume, never
+    rolling back to an earlier expiry.
+    Returns session dates and the index of the active contract for each.
+    """
+    activity = pd.concat(
+        [df["volume"].groupby(session_labels(df.index)).sum() for df in frames],
+        axis=1
+    ).fillna(0).sort_index()
+
+    values = activity.to_numpy(dtype=np.float64)
+    traded = values.sum(axis=1) > 0
+    sessions = activity.index.to_numpy()[traded]
+    active = np.maximum.accumulate(values[traded].argmax(axis=1))
+    return sessions, active
+
+
+def _close_asof(df: pd.DataFrame, ts: pd.Timestamp) -> float:
+    """Last close strictly before `ts`, or NaN."""
+    pos = df.index.searchsorted(ts, side="left")
+    return float(df["close"].iloc[pos - 1]) if pos > 0 else np.nan
+
+
+def stitch_contracts(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Build a back-adjusted continuous series from individual contract frames.
+    `frames` must be ordered by expiry. Each roll happens at the start of the first
+    session in which the next contract trades the most volume; its gap is the difference
+    between the two contracts' last closes before that moment. All earlier prices are
+    shifted by the sum of the gaps that follow them (additive back-adjustment), applied
+    with one searchsorted over the roll times, so the latest segment keeps real prices.
+    The result carries `contract` (index into the expiry order) and `roll_offset` columns.
+    """
+    symbols = [symbol for symbol, df in frames.items() if df is not None and not df.empty]
+    contracts = [frames[symbol] for symbol in symbols]
+    if not contracts:
+        return pd.DataFrame()
+
+    sessions, active = _roll_schedule(contracts)
+    changes = np.flatnonzero(active[1:] != active[:-1]) + 1
+
+    roll_times, gaps = [], []
+    for pos in changes:
+        roll_time = session_bounds(pd.Timestamp(sessions[pos]))[0].tz_convert("UTC")
+        old, new = contracts[active[pos - 1]], contracts[active[pos]]
+        gap = _close_asof(new, roll_time) - _close_asof(old, roll_time)
+        if np.isnan(gap):
+            logger.warning(f"No overlapping prices at the {symbols[active[pos]]} roll - using a zero gap")
+            gap = 0.0
+        roll_times.append(roll_time)
+        gaps.append(gap)
+        logger.info(f"Roll {symbols[active[pos - 1]]} → {symbols[active[pos]]} at {roll_time:%Y-%m-%d}: gap {gap:+.2f}")
+
+    # Segment k runs from roll k-1 to roll k on the contract active in between
+    sessions_start = session_bounds(pd.Timestamp(sessions[0]))[0].tz_convert("UTC")
+    bounds = [sessions_start, *roll_times, None]
+    segment_contracts = [active[0], *active[changes]]
+    segments = []
+    for k, contract in enumerate(segment_contracts):
+        df = contracts[contract]
+        lo = df.index.searchsorted(bounds[k], side="left")
+        hi = df.index.searchsorted(bounds[k + 1], side="left") if bounds[k + 1] is not None else len(df)
+        segment = df.iloc[lo:hi].copy()
+        segment["contract"] = np.int16(contract)
+        segments.append(segment)
+
+    stitched = pd.concat(segments)
+
+    # Offset for a bar = sum of the gaps of every roll after it
+    remaining = np.concatenate((np.cumsum(np.asarray(gaps)[::-1])[::-1], [0.0]))
+    roll_ns = pd.DatetimeIndex(roll_times).as_unit("ns").asi8 if roll_times else np.empty(0, dtype=np.int64)
+    offsets = remaining[np.searchsorted(roll_ns, stitched.index.as_unit("ns").asi8, side="right")]
+
+    columns = [col for col in PRICE_COLUMNS if col in stitched.columns]
+    adjusted = stitched[columns].to_numpy(dtype=np.float64) + offsets[:, None]
+    for i, col in enumerate(columns):
+        stitched[col] = adjusted[:, i].astype(stitched[col].dtype)
+    stitched["roll_offset"] = offsets.astype(np.float32)
+
+    return stitched
@@ -0,0 +1,167 @@
+import logging
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from src.providers import period_to_offset
+
+logger = logging.getLogger(__name__)
+
+
+class RollingCorrelation:
+    """
+    Incremental Pearson correlation over the last `window` observations of k series.
+    Keeps a ring buffer plus running sums and the co-moment matrix, so each new bar
+    costs O(k²) instead of a full DataFrame.corr() pass. Values are shifted by a
+    reference row before accumulating to limit cancellation on price levels, and
+    the sums are recomputed from the buffer every `window` updates to stop drift.
+    The matrix matches DataFrame.corr() over the same rows.
+    """
+
+    def __init__(self, names: List[str], window: int):
+        self.names = list(names)
+        self.window = max(2, window)
+        k = len(self.names)
+        self._buffer = np.empty((self.window, k), dtype=np.float64)
+        self._count = 0
+        self._pos = 0  # slot the next observation is written to
+        self._shift = np.zeros(k)
+        self._sum = np.zeros(k)
+        self._comoment = np.zeros((k, k))
+        self._updates_since_resync = 0
+        self.last_timestamp: Optional[pd.Timestamp] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _add(self, row: np.ndarray, sign: float):
+        shifted = row - self._shift
+        self._sum += sign * shifted
+        self._comoment += sign * np.outer(shifted, shifted)
+
+    def _resync(self):
+        """Recompute the running sums from the buffer, re-centred on its mean."""
+        rows = self._buffer[:self._count]
+        self._shift = rows.mean(axis=0)
+        shifted = rows - self._shift
+        self._sum = shifted.sum(axis=0)
+        self._comoment = shifted.T @ shifted
+        self._updates_since_resync = 0
+
+    def update(self, row: np.ndarray, timestamp: Optional[pd.Timestamp] = None):
+        """
+        Add one aligned observation. A repeat of the newest timestamp replaces it
+        (the last bar may still be forming); older timestamps are ignored.
+        """
+        row = np.asarray(row, dtype=np.float64)
+        if not np.all(np.isfinite(row)):
+            return
+
+        if timestamp is not None and self.last_timestamp is not None:
+            if timestamp < self.last_timestamp:
+                return
+            if timestamp == self.last_timestamp:
+                last = (self._pos - 1) % self.window
+                self._add(self._buffer[last], -1.0)
+                self._buffer[last] = row
+                self._add(row, 1.0)
+                return
+
+        if self._count == 0:
+            self._shift = row.copy()
+
+        if self._count == self.window:
+            self._add(self._buffer[self._pos], -1.0)
+        else:
+            self._count += 1
+
+        self._buffer[self._pos] = row
+        self._add(row, 1.0)
+        self._pos = (self._pos + 1) % self.window
+        self.last_timestamp = timestamp
+
+        self._updates_since_resync += 1
+        if self._updates_since_resync >= self.window:
+            self._resync()
+
+    def matrix(self) -> pd.DataFrame:
+        """Current correlation matrix (NaN where a series has no variance)."""
+        n = self._count
+        if n < 2:
+            return pd.DataFrame(np.nan, index=self.names, columns=self.names)
+
+        cov = (self._comoment - np.outer(self._sum, self._sum) / n) / (n - 1)
+        std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        corr = np.clip(corr, -1.0, 1.0)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.names, columns=self.names)
+
+
+def multi_horizon_correlations(closes_by_bar: Dict[str, pd.DataFrame], windows: List[str]) -> Dict:
+    """
+    Return correlations for every (bar size, window) horizon in one batched pass.
+    `closes_by_bar` maps a bar size to its aligned closes (one column per symbol,
+    identical columns across bar sizes). Log returns of all bar sizes are stacked
+    into one matrix; each horizon is a 0/1 row mask over it, so the sums and
+    co-moments of all horizons come out of a single einsum. Windows are trading-day
+    spans ("5d", "20d") counted back from each bar size's newest bar.
+    """
+    names = None
+    blocks, block_masks, horizons = [], [], []
+
+    for bar_size, closes in closes_by_bar.items():
+        if names is None:
+            names = list(closes.columns)
+        if len(closes) < 2:
+            continue
+
+        returns = np.diff(np.log(closes[names].to_numpy(dtype=np.float64)), axis=0)
+        timestamps = closes.index[1:]
+        masks = []
+        for window in windows:
+            offset = period_to_offset(window)
+            start = timestamps[-1] - offset if offset is not None else timestamps[0]
+            masks.append(timestamps >= start)
+            horizons.append(f"{bar_size}/{window}")
+
+        blocks.append(returns)
+        block_masks.append(np.array(masks, dtype=np.float64))
+
+    if not blocks:
+        return {"symbols": names or [], "horizons": [], "correlations": np.empty((0, 0, 0)), "observations": np.empty(0)}
+
+    returns = np.concatenate(blocks)
+    returns[~np.isfinite(returns)] = 0.0
+
+    # Block-diagonal layout: horizon h only sees the rows of its own bar size
+    masks = np.zeros((len(horizons), len(returns)))
+    row, col = 0, 0
+    for block, mask in zip(blocks, block_masks):
+        masks[row:row + len(mask), col:col + len(block)] = mask
+        row, col = row + len(mask), col + len(block)
+
+    n = masks.sum(axis=1)
+    sums = masks @ returns
+    comoments = np.einsum("ht,ti,tj->hij", masks, returns, returns, optimize=True)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (comoments - sums[:, :, None] * sums[:, None, :] / n[:, None, None]) / (n - 1)[:, None, None]
+        std = np.sqrt(np.clip(np.diagonal(cov, axis1=1, axis2=2), 0.0, None))
+        corr = np.clip(cov / (std[:, :, None] * std[:, None, :]), -1.0, 1.0)
+    corr[n < 3] = np.nan
+
+    return {"symbols": names, "horizons": horizons, "correlations": corr, "observations": n.astype(int)}
+
+
+def correlation_pairs(result: Dict) -> Dict[str, Dict[str, Optional[float]]]:
+    """Flatten a multi_horizon_correlations result to {horizon: {"A/B": corr}} for reports."""
+    names = result["symbols"]
+    pairs = {}
+    for h, horizon in enumerate(result["horizons"]):
+        matrix = result["correlations"][h]
+        pairs[horizon] = {
+            f"{names[i]}/{names[j]}": None if np.isnan(matrix[i, j]) else round(float(matrix[i, j]), 3)
+            for i in range(len(names)) for j in range(i + 1, len(names))
+        }
+    return pairs
@@ -1,12 +1,28 @@
-import asyncio
+import io
 import logging
 import pandas as pd
+import requests
 from typing import Dict, Optional
+from src.executors import run_cpu, run_io
+from src.resilience import retry_on_failure
 
 logger = logging.getLogger(__name__)
 
 # CFTC COT Report URL - Futures Only (Disaggregated)
 COT_URL = "https://www.cftc.gov/dea/newcot/deafut.txt"
+COT_TIMEOUT_SECONDS = 30
+
+
+def download_cot_report(url: str = COT_URL) -> str:
+    """Download the raw COT CSV text (blocking; runs on the I/O pool)."""
+    response = requests.get(url, timeout=COT_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    return response.text
+
+
+def parse_cot_report(csv_text: str) -> pd.DataFrame:
+    """Parse the COT CSV (CPU-bound; runs on the process pool)."""
+    return pd.read_csv(io.StringIO(csv_text), low_memory=False)
 
 
 class COTAnalyzer:
@@ -15,18 +31,19 @@ class COTAnalyzer:
     def __init__(self):
         pass
     
+    @retry_on_failure(max_retries=3, delay=2.0, source="cftc")
+    async def _download_cot(self) -> str:
+        return await run_io(download_cot_report)
+
     async def fetch_cot_data(self) -> Optional[pd.DataFrame]:
         """Fetch latest COT data from CFTC."""
-        def _fetch_sync():
-            try:
-                df = pd.read_csv(COT_URL, low_memory=False)
-                logger.info(f"COT data fetched: {len(df)} rows, {len(df.columns)} columns")
-                return df
-            except Exception as e:
-                logger.error(f"Error fetching COT data: {e}")
-                return None
-        
-        return await asyncio.to_thread(_fetch_sync)
+        try:
+            df = await run_cpu(parse_cot_report, await self._download_cot())
+            logger.info(f"COT data fetched: {len(df)} rows, {len(df.columns)} columns")
+            return df
+        except Exception as e:
+            logger.error(f"Error fetching COT data: {e}")
+            return None
     
     async def get_gold_positioning(self) -> Dict:
         """Get Gold futures positioning from COT report."""
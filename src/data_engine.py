@@ -1,196 +1,791 @@
 import asyncio
 import logging
+import time
+from collections import deque
+from datetime import date, timedelta
 import numpy as np
 import pandas as pd
-import yfinance as yf
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
-from functools import wraps
+from typing import Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
-from src.config import SYMBOLS, VOLATILITY_LOOKBACK
+from pathlib import Path
+from src.analysis_engine import atr_frame
+from src.bar_store import BarColumns, BarStore
+from src.config import (ANALYSIS_SESSIONS, ATR_PERIOD, BAR_PRICE_DTYPE, BAR_STORE_DIR, COMPOSITE_PROFILE_SESSIONS,
+                        CORRELATION_BAR_SIZES, CORRELATION_HORIZON_WINDOWS, CORRELATION_WINDOW,
+                        FETCH_BATCH_SIZE, FETCH_CACHE_TTL_SECONDS, LIVE_FEED_MAX_AGE_SECONDS, PROFILE_TICK_SIZE, SYMBOLS, USE_CONTINUOUS_CONTRACT,
+                        VOLATILITY_LOOKBACK, VOLATILITY_SOURCE)
+from src.continuous_contract import contract_symbols, stitch_contracts
+from src.correlation_engine import RollingCorrelation, multi_horizon_correlations
+from src.data_quality import DataQualityValidator, interval_to_timedelta
+from src.executors import run_cpu, run_io
+from src.fetch_scheduler import FetchScheduler, fetch_priority
+from src.live_feed import BarFeed, SessionAccumulator
+from src.providers import MarketDataProvider, get_provider, period_to_offset
+from src.resilience import retry_on_failure
+from src.session_calendar import (SessionIndex, last_completed_session, session_bounds, session_start_for,
+                                  sessions_start)
+from src.volume_profile import CompositeProfile, SessionProfileStore, session_tick_histograms
 
 logger = logging.getLogger(__name__)
 
-# CME Gold Futures Session Times (US/Eastern)
-CME_SESSION_START_HOUR = 18  # 6:00 PM ET (previous day)
-CME_SESSION_END_HOUR = 17    # 5:00 PM ET (current day)
 ET_TZ = ZoneInfo("America/New_York")
 
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+BAR_COLUMNS = PRICE_COLUMNS + ["volume"]
 
-def retry_on_failure(max_retries: int = 3, delay: float = 1.0):
-    """Decorator for retrying async functions on failure."""
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            for attempt in range(max_retries):
-                try:
-                    return await func(*args, **kwargs)
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise
-                    logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {e}. Retrying...")
-                    await asyncio.sleep(delay * (attempt + 1))
-            return None
-        return wrapper
-    return decorator
+# Fetch window [start, end) in UTC; end None means "up to now"
+Window = Tuple[pd.Timestamp, Optional[pd.Timestamp]]
+# Provider request that brings a symbol's store up to date: (symbol, interval, request start, request end)
+FetchKey = Tuple[str, str, pd.Timestamp, Optional[pd.Timestamp]]
+
+
+def normalize_bars(df: pd.DataFrame, price_dtype: str = BAR_PRICE_DTYPE) -> pd.DataFrame:
+    """
+    Apply the compact dtype policy to a bar frame.
+    Keeps only OHLCV (drops "adj close" and friends), casts prices to `price_dtype`,
+    volume to the smallest integer type that holds it, and the index to UTC
+    datetime64[ns] (int64 nanoseconds). Logs the bytes saved.
+    """
+    if df is None or df.empty:
+        return df
+
+    bytes_before = int(df.memory_usage(deep=True).sum())
+
+    columns = {}
+    for col in PRICE_COLUMNS:
+        if col in df.columns:
+            columns[col] = df[col].to_numpy(dtype=price_dtype)
+    if "volume" in df.columns:
+        volume = np.rint(np.nan_to_num(df["volume"].to_numpy(dtype=np.float64)))
+        volume_dtype = np.int32 if volume.max(initial=0) <= np.iinfo(np.int32).max else np.int64
+        columns["volume"] = volume.astype(volume_dtype)
+
+    index = df.index
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    index = index.tz_convert("UTC").as_unit("ns")
+    index.name = "timestamp"
+
+    compact = pd.DataFrame(columns, index=index)
+
+    bytes_after = int(compact.memory_usage(deep=True).sum())
+    logger.info(f"Normalized {len(compact)} bars: {bytes_before:,} → {bytes_after:,} bytes "
+                f"({bytes_before - bytes_after:,} saved)")
+    return compact
+
+
+# Resample rules for bars derived from the 5m base: (pandas rule, bin offset on the ET wall clock).
+# Offsets anchor 4h and session bins to the 18:00 ET CME open.
+RESAMPLE_RULES = {
+    "15m": ("15min", "0h"),
+    "30m": ("30min", "0h"),
+    "1h": ("1h", "0h"),
+    "4h": ("4h", "2h"),
+    "session": ("24h", "18h"),
+}
+
+OHLCV_AGGREGATION = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Build coarser bars (15m, 30m, 1h, 4h, session) from a finer OHLCV frame.
+    Open=first, High=max, Low=min, Close=last, Volume=sum. Bins are labelled by
+    their start time and laid out on the naive ET wall clock, so 4h and session
+    bins start at 18:00 ET on both sides of a DST change (CME is closed during
+    the 02:00 Sunday transition). Empty bins (maintenance break, weekends) are dropped.
+    """
+    if interval not in RESAMPLE_RULES:
+        raise ValueError(f"Unsupported resample interval: {interval}")
+
+    rule, offset = RESAMPLE_RULES[interval]
+    columns = {col: how for col, how in OHLCV_AGGREGATION.items() if col in df.columns}
+
+    bars = df[list(columns)]
+    bars.index = df.index.tz_convert(ET_TZ).tz_localize(None)
+
+    resampled = bars.resample(rule, offset=offset, label="left", closed="left").agg(columns)
+    resampled = resampled.dropna(subset=["close"])
+
+    resampled.index = resampled.index.tz_localize(ET_TZ, ambiguous=True, nonexistent="shift_forward").tz_convert("UTC")
+    resampled.index.name = "timestamp"
+    return resampled
+
+
+def build_session_candles(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregate every CME session in a bar frame in one grouped pass.
+    Bars are labelled with their session date by SessionIndex, then each column is
+    reduced per session with ufunc.reduceat over the contiguous session blocks.
+    Returns one row per session (indexed by session date) with OHLCV, VWAP, pivot,
+    bar count and first/last bar times.
+    """
+    columns = ["open", "high", "low", "close", "volume", "vwap", "pivot", "bars", "first_bar_time", "last_bar_time"]
+    if df is None or df.empty:
+        return pd.DataFrame(columns=columns)
+
+    session_index = SessionIndex(df.index)
+    starts = session_index.offsets[:-1]
+    ends = session_index.offsets[1:]
+
+    high = df["high"].to_numpy(dtype=np.float64)
+    low = df["low"].to_numpy(dtype=np.float64)
+    close = df["close"].to_numpy(dtype=np.float64)
+    volume = np.nan_to_num(df["volume"].to_numpy(dtype=np.float64))
+
+    session_high = np.fmax.reduceat(high, starts)
+    session_low = np.fmin.reduceat(low, starts)
+    session_close = close[ends - 1]
+    session_volume = np.add.reduceat(volume, starts)
+
+    # VWAP: Sum(Typical Price * Volume) / Sum(Volume), falling back to mean typical price
+    typical_price = (high + low + close) / 3
+    bar_counts = ends - starts
+    pv = np.add.reduceat(typical_price * volume, starts)
+    mean_typical = np.add.reduceat(typical_price, starts) / bar_counts
+    traded = session_volume > 0
+    vwap = np.where(traded, pv / np.where(traded, session_volume, 1.0), mean_typical)
+
+    candles = pd.DataFrame({
+        "open": df["open"].to_numpy(dtype=np.float64)[starts],
+        "high": session_high,
+        "low": session_low,
+        "close": session_close,
+        "volume": session_volume,
+        "vwap": vwap,
+        "pivot": (session_high + session_low + session_close) / 3,
+        "bars": bar_counts.astype(np.int32),
+        "first_bar_time": df.index[starts],
+        "last_bar_time": df.index[ends - 1],
+    }, index=pd.DatetimeIndex(session_index.session_dates, name="session_date"))
+
+    return candles
+
+
+def aggregate_session(df: pd.DataFrame, symbol: str, session_start: pd.Timestamp,
+                      session_end: pd.Timestamp) -> Optional[Dict]:
+    """
+    Aggregate 5m bars into the CME session candle between `session_start` and `session_end`:
+    OHLCV, VWAP, pivot and the first/last bar times. None if no bar falls in the session.
+    """
+    # Convert index to Eastern Time
+    df.index = df.index.tz_convert("America/New_York")
+
+    # Slice the session window via binary search on the sorted bar index
+    session_df = df.iloc[SessionIndex(df.index).window(session_start, session_end)]
+
+    if session_df.empty:
+        return None
+
+    # Aggregate session data
+    session_open = float(session_df["open"].iloc[0])
+    session_high = float(session_df["high"].max())
+    session_low = float(session_df["low"].min())
+    session_close = float(session_df["close"].iloc[-1])
+    session_volume = float(session_df["volume"].sum())
+
+    # Calculate VWAP: Sum(Typical Price * Volume) / Sum(Volume)
+    typical_price = (session_df["high"] + session_df["low"] + session_df["close"]) / 3
+    if session_volume > 0:
+        vwap = float((typical_price * session_df["volume"]).sum() / session_volume)
+    else:
+        vwap = float(typical_price.mean())
+
+    # Calculate Pivot Point (H + L + C) / 3
+    pivot = (session_high + session_low + session_close) / 3
+
+    return {
+        "symbol": symbol,
+        "session_start": session_start.isoformat(),
+        "session_end": session_end.isoformat(),
+        "session_date": session_end.strftime('%Y-%m-%d'),
+        "open": round(session_open, 2),
+        "high": round(session_high, 2),
+        "low": round(session_low, 2),
+        "close": round(session_close, 2),
+        "volume": round(session_volume, 0),
+        "vwap": round(vwap, 2),
+        "pivot": round(pivot, 2),
+        "bars_in_session": len(session_df),
+        "first_bar_time": str(session_df.index[0]),
+        "last_bar_time": str(session_df.index[-1])
+    }
+
+
+def horizon_correlations(hourly: Dict[str, pd.DataFrame], bar_sizes: List[str], windows: List[str]) -> Dict:
+    """Resample aligned 1h frames to each bar size and run multi_horizon_correlations over them."""
+    closes_by_bar = {}
+    for bar_size in bar_sizes:
+        closes = pd.DataFrame({
+            name: (df if bar_size == "1h" else resample_ohlcv(df, bar_size))["close"]
+            for name, df in hourly.items()
+        })
+        closes_by_bar[bar_size] = closes.dropna()
+    return multi_horizon_correlations(closes_by_bar, windows)
 
 
 class MarketData:
     """Market data fetcher with proper CME session alignment."""
     
-    def __init__(self):
-        pass
+    def __init__(self, store: Optional[BarStore] = None, cache_ttl: float = FETCH_CACHE_TTL_SECONDS,
+                 provider: Optional[MarketDataProvider] = None, scheduler: Optional[FetchScheduler] = None):
+        self.provider = provider if provider is not None else get_provider()
+        self.scheduler = scheduler if scheduler is not None else FetchScheduler()
+        self.validator = DataQualityValidator()
+        if store is None and self.provider.name == "yahoo":
+            store = BarStore()
+        elif store is None:
+            # Keep replayed bars out of the live Yahoo store; each replay clock gets its own
+            # store so a run never sees bars (or derived state) cached by a later-clock run
+            root = Path(BAR_STORE_DIR) / self.provider.name
+            if self.provider.name == "replay":
+                root /= f"{self.provider.now():%Y%m%dT%H%M%SZ}"
+            store = BarStore(str(root))
+        self.store = store
+        self.cache_ttl = cache_ttl
+        # Single-flight state keyed by provider request, not caller window: when each
+        # request last completed, and the store updates still running
+        self._fetch_cache: Dict[FetchKey, float] = {}
+        self._inflight: Dict[FetchKey, asyncio.Task] = {}
+        # Developing-session aggregates per symbol, fed by stream_bars
+        self._live_sessions: Dict[str, SessionAccumulator] = {}
+        # Rolling macro correlation, advanced only by bars not seen on earlier calls
+        self._correlation: Optional[RollingCorrelation] = None
+        # Per-session tick histograms (persisted beside the bar store) and the composites built from them
+        self.profile_store = SessionProfileStore(str(self.store.root / "profiles"))
+        self._session_histograms: Dict[Tuple[str, float], Dict[date, Tuple[int, np.ndarray]]] = {}
+        self._composites: Dict[Tuple[str, float, int], CompositeProfile] = {}
 
-    def _get_last_completed_session(self, now_et: datetime) -> Tuple[datetime, datetime]:
+    def _plan_requests(self, symbols: List[str], interval: str, window: Window) -> Dict[str, List[Tuple[str, FetchKey]]]:
         """
-        Calculate the last completed CME session window.
-        CME Session: 18:00 ET (Prev Day) to 17:00 ET (Current Day)
+        Provider requests (label, key) each symbol's bar store needs to cover `window`
+        ([start, end), end None = up to now), with the start clipped to the history the
+        provider serves: the whole window when nothing usable is stored, else the head
+        before the first stored bar and the tail from the last one. Full and tail
+        requests run to the provider clock, so every caller resuming from the same bar
+        makes the same request whatever its window.
         """
-        current_hour = now_et.hour
-        
-        if current_hour >= CME_SESSION_END_HOUR:
-            # After 5 PM - last session ended today at 17:00
-            session_end = now_et.replace(hour=CME_SESSION_END_HOUR, minute=0, second=0, microsecond=0)
-            session_start = (now_et - timedelta(days=1)).replace(hour=CME_SESSION_START_HOUR, minute=0, second=0, microsecond=0)
-        else:
-            # Before 5 PM - last session ended yesterday at 17:00
-            session_end = (now_et - timedelta(days=1)).replace(hour=CME_SESSION_END_HOUR, minute=0, second=0, microsecond=0)
-            session_start = (now_et - timedelta(days=2)).replace(hour=CME_SESSION_START_HOUR, minute=0, second=0, microsecond=0)
-        
-        return session_start, session_end
+        start, end = window
+        start = self.provider.clip_history(interval, start)[0][0]
+        now = self.provider.now()
+        limit = self.provider.interval_limits.get(interval)
+        spacing = interval_to_timedelta(interval) or pd.Timedelta(0)
+
+        requests = {}
+        for symbol in symbols:
+            stored = self.store.load_columns(symbol, interval)
+            if stored is None or (limit is not None and now - stored.last_timestamp >= limit):
+                requests[symbol] = [("Full", (symbol, interval, start, None))]
+                continue
+            requests[symbol] = []
+            if stored.first_timestamp > start + pd.Timedelta(days=1):
+                requests[symbol].append(("Head", (symbol, interval, start, stored.first_timestamp)))
+            # The last stored bar is re-fetched: it may have been captured mid-formation
+            if (end is None or stored.last_timestamp + spacing < end) and stored.last_timestamp < now:
+                requests[symbol].append(("Incremental", (symbol, interval, stored.last_timestamp, None)))
+        return requests
+
+    def _download_sync(self, label: str, keys: List[FetchKey], interval: str) -> Dict[str, pd.Timestamp]:
+        """
+        Download one batch of requests of the same kind as a single provider request,
+        split into spans the provider accepts, and append the bars to the store.
+        Returns the newest stored bar per symbol.
+        """
+        symbols = [key[0] for key in keys]
+        start = min(key[2] for key in keys)
+        end = None if any(key[3] is None for key in keys) else max(key[3] for key in keys)
+        logger.info(f"{label} fetch {', '.join(symbols)} {interval} "
+                    f"{start:%Y-%m-%d %H:%M} → {end or self.provider.now():%Y-%m-%d %H:%M}")
+
+        downloaded: Dict[str, List[pd.DataFrame]] = {}
+        for chunk_start, chunk_end in self.provider.clip_history(interval, start, end):
+            frames = self.provider.download(symbols, interval, start=chunk_start.to_pydatetime(),
+                                            end=chunk_end.to_pydatetime() if chunk_end is not None else None)
+            for symbol, frame in frames.items():
+                downloaded.setdefault(symbol, []).append(frame)
+
+        newest = {}
+        for symbol in symbols:
+            frames = downloaded.get(symbol)
+            bars = self.store.append(symbol, interval, normalize_bars(pd.concat(frames)) if frames else None)
+            if bars is not None and not bars.empty:
+                newest[symbol] = bars.last_timestamp
+        return newest
+
+    def _read_window(self, symbols: List[str], interval: str, window: Window) -> Dict[str, pd.DataFrame]:
+        """
+        Bars in `window` for each symbol, sliced from the memory-mapped store so only the
+        window is materialized. Nothing after the provider clock is returned, even if the
+        store holds it. Symbols without data are omitted.
+        """
+        start, end = window
+        now = self.provider.now()
+        last = now if end is None else min(now, end - pd.Timedelta(1, unit="ns"))
+
+        frames = {}
+        for symbol in symbols:
+            bars = self.store.load_columns(symbol, interval)
+            bars = bars.window(start, last) if bars is not None else None
+            if bars is None or bars.empty:
+                logger.warning(f"No data fetched for {symbol}")
+                continue
+            frames[symbol] = bars.to_frame()
+        return frames
+
+    def load_bar_columns(self, symbol: str, interval: str) -> Optional[BarColumns]:
+        """
+        Memory-mapped columnar view of every stored bar for a symbol/interval.
+        Session and window slices (`bars.session(date)`, `bars.window(start, end)`)
+        are zero-copy and can be passed straight to LocalAnalyst. Bars after the provider
+        clock are left out.
+        """
+        bars = self.store.load_columns(symbol, interval)
+        if bars is None or bars.empty:
+            return bars
+        return bars.window(pd.Timestamp(int(bars.timestamps[0]), tz="UTC"), self.provider.now())
+
+    def session_window(self, sessions: int = ANALYSIS_SESSIONS) -> Window:
+        """Window from the open of the last `sessions` completed CME sessions up to now."""
+        return sessions_start(sessions, self.provider.now()), None
+
+    def period_window(self, period: str) -> Window:
+        """
+        Window for a Yahoo-style period ("5d", "3mo"), widened to the open of the session it
+        starts in so the window (and its cache key) stays fixed for a whole session.
+        """
+        now = self.provider.now()
+        offset = period_to_offset(period)
+        return session_start_for(now - offset if offset is not None else now - pd.DateOffset(years=1)), None
 
-    @retry_on_failure(max_retries=3, delay=1.0)
     async def fetch_session_ohlcv(self, symbol: str = "GC=F") -> Optional[Dict]:
         """
         Fetch and aggregate 5m data into a proper CME session candle.
         Returns dict with Open, High, Low, Close, Volume, VWAP for the last completed session.
+        Only that session's window is requested, and a session already in the bar store
+        needs no download at all.
         """
-        def _fetch_and_aggregate():
-            # Download 5-minute data for the past 5 days
-            df = yf.download(tickers=symbol, interval="5m", period="5d", progress=False)
-            
-            if df is None or df.empty:
-                logger.warning(f"No data fetched for {symbol}")
-                return None
-            
-            # Handle MultiIndex columns (yfinance returns (Price, Ticker) format)
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-            
-            # Standardize column names
-            df.columns = df.columns.str.lower()
-            
-            # Forward fill NaN values
-            df = df.ffill()
-            
-            # Convert index to Eastern Time
-            if df.index.tz is None:
-                df.index = df.index.tz_localize("UTC")
-            df.index = df.index.tz_convert("America/New_York")
-            
-            # Get current time in ET
-            now_et = datetime.now(ET_TZ)
-            
-            # Calculate last completed session window
-            session_start, session_end = self._get_last_completed_session(now_et)
-            
-            # Make session times timezone-aware
-            session_start = session_start.replace(tzinfo=ET_TZ)
-            session_end = session_end.replace(tzinfo=ET_TZ)
-            
-            logger.info(f"Session window: {session_start} to {session_end}")
-            
-            # Filter to session window
-            session_df = df[(df.index >= session_start) & (df.index <= session_end)]
-            
-            if session_df.empty:
-                logger.warning(f"No data in session window for {symbol}")
-                return None
-            
-            # Aggregate session data
-            session_open = float(session_df["open"].iloc[0])
-            session_high = float(session_df["high"].max())
-            session_low = float(session_df["low"].min())
-            session_close = float(session_df["close"].iloc[-1])
-            session_volume = float(session_df["volume"].sum())
-            
-            # Calculate VWAP: Sum(Typical Price * Volume) / Sum(Volume)
-            typical_price = (session_df["high"] + session_df["low"] + session_df["close"]) / 3
-            if session_volume > 0:
-                vwap = float((typical_price * session_df["volume"]).sum() / session_volume)
-            else:
-                vwap = float(typical_price.mean())
-            
-            # Calculate Pivot Point (H + L + C) / 3
-            pivot = (session_high + session_low + session_close) / 3
-            
-            # Get the actual close bar timestamp for verification
-            close_bar_time = session_df.index[-1]
-            open_bar_time = session_df.index[0]
-            
-            # Log verification data
-            logger.info("=" * 40)
-            logger.info("🔍 CME SESSION VERIFICATION DATA")
-            logger.info("=" * 40)
-            logger.info(f"  Session Date: {session_end.strftime('%Y-%m-%d')}")
-            logger.info(f"  First Bar:  {open_bar_time} → Open: ${session_open:.2f}")
-            logger.info(f"  Last Bar:   {close_bar_time} → Close: ${session_close:.2f}")
-            logger.info(f"  High: ${session_high:.2f} | Low: ${session_low:.2f}")
-            logger.info(f"  Pivot (H+L+C)/3: ${pivot:.2f}")
-            logger.info("=" * 40)
-            logger.info("⚠️  VERIFY: Compare 'Close' above with CME 'Prior Settle'")
-            logger.info("   https://www.cmegroup.com/markets/metals/precious/gold.settlements.html")
-            logger.info("=" * 40)
-            
-            return {
-                "symbol": symbol,
-                "session_start": session_start.isoformat(),
-                "session_end": session_end.isoformat(),
-                "session_date": session_end.strftime('%Y-%m-%d'),
-                "open": round(session_open, 2),
-                "high": round(session_high, 2),
-                "low": round(session_low, 2),
-                "close": round(session_close, 2),
-                "volume": round(session_volume, 0),
-                "vwap": round(vwap, 2),
-                "pivot": round(pivot, 2),
-                "bars_in_session": len(session_df),
-                "first_bar_time": str(open_bar_time),
-                "last_bar_time": str(close_bar_time)
-            }
-        
-        return await asyncio.to_thread(_fetch_and_aggregate)
-
-    @retry_on_failure(max_retries=3, delay=1.0)
-    async def fetch_ohlcv(self, symbol: str, period: str = "1mo", interval: str = "1h") -> Optional[pd.DataFrame]:
-        """Fetch OHLCV data from Yahoo Finance (legacy method for compatibility)."""
-        def _fetch_sync():
-            df = yf.download(tickers=symbol, interval=interval, period=period, progress=False)
-            
-            if df is None or df.empty:
-                return None
-            
-            # Handle MultiIndex columns
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-            
-            df.columns = df.columns.str.lower()
-            df = df.ffill()
-            df.index.name = "timestamp"
-            return df
-
-        df = await asyncio.to_thread(_fetch_sync)
+        session_start, session_end = session_bounds(last_completed_session(self.provider.now()))
+        df = await self.fetch_ohlcv(symbol, interval="5m", start=session_start, end=session_end)
 
         if df is None or df.empty:
             logger.warning(f"No data fetched for {symbol}")
             return None
 
-        return df
+        session = await run_cpu(aggregate_session, df, symbol, session_start, session_end)
+        if session is None:
+            logger.warning(f"No data in session window for {symbol}")
+            return None
+
+        # Log verification data
+        logger.info(f"Session window: {session_start} to {session_end}")
+        logger.info("=" * 40)
+        logger.info("🔍 CME SESSION VERIFICATION DATA")
+        logger.info("=" * 40)
+        logger.info(f"  Session Date: {session['session_date']}")
+        logger.info(f"  First Bar:  {session['first_bar_time']} → Open: ${session['open']:.2f}")
+        logger.info(f"  Last Bar:   {session['last_bar_time']} → Close: ${session['close']:.2f}")
+        logger.info(f"  High: ${session['high']:.2f} | Low: ${session['low']:.2f}")
+        logger.info(f"  Pivot (H+L+C)/3: ${session['pivot']:.2f}")
+        logger.info("=" * 40)
+        logger.info("⚠️  VERIFY: Compare 'Close' above with CME 'Prior Settle'")
+        logger.info("   https://www.cmegroup.com/markets/metals/precious/gold.settlements.html")
+        logger.info("=" * 40)
+
+        return session
+
+    async def stream_bars(self, symbol: str, feed: BarFeed):
+        """
+        Consume a live feed bar by bar, keeping running session aggregates for `symbol`.
+        Each bar costs O(1) regardless of how far into the session it arrives; read the
+        developing session at any time with live_session(). Runs until cancelled.
+        """
+        accumulator = self._live_sessions.setdefault(symbol, SessionAccumulator())
+        logger.info(f"Streaming live bars for {symbol}")
+
+        async for bar in feed.bars():
+            previous_session = accumulator.session_date
+            accumulator.update(bar)
+            if previous_session is not None and accumulator.session_date != previous_session:
+                logger.info(f"{symbol} live session rolled over to {accumulator.session_date}")
+
+    def live_session(self, symbol: str = "GC=F", max_age: float = LIVE_FEED_MAX_AGE_SECONDS) -> Optional[Dict]:
+        """
+        Developing session candle built by stream_bars, or None if nothing has streamed
+        or the newest bar is more than `max_age` seconds old (the feed has stopped).
+        """
+        accumulator = self._live_sessions.get(symbol)
+        if accumulator is None or accumulator.last_bar_time is None:
+            return None
+
+        age = (self.provider.now() - accumulator.last_bar_time).total_seconds()
+        if age > max_age:
+            logger.warning(f"Live {symbol} feed silent since {accumulator.last_bar_time:%Y-%m-%d %H:%M} UTC - ignoring it")
+            return None
+        return accumulator.snapshot()
+
+    async def fetch_ohlcv(self, symbol: str, period: str = "1mo", interval: str = "1h",
+                          start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+        """
+        Fetch OHLCV data, coalescing duplicate requests.
+        The window is [start, end) when `start` is given, otherwise `period` back from now.
+        Callers whose windows need the same provider request share one in-flight download,
+        which is reused for `cache_ttl` seconds; each caller's window is then sliced from
+        the bar store, so downstream mutation cannot leak between consumers.
+        """
+        frames = await self.fetch_ohlcv_batch([symbol], period=period, interval=interval, start=start, end=end)
+        return frames.get(symbol)
+
+    async def fetch_ohlcv_batch(self, symbols: List[str], period: str = "5d", interval: str = "1h",
+                                start: Optional[pd.Timestamp] = None,
+                                end: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLCV data for several symbols with one multi-ticker download.
+        The store update each symbol needs is keyed by its provider request (symbol,
+        interval, resume start, request end): requests completed within `cache_ttl` or
+        already in flight are not repeated, and the rest of the same kind share one
+        batched request. Symbols without data are omitted.
+        """
+        if start is not None:
+            window = (pd.Timestamp(start).tz_convert("UTC"), pd.Timestamp(end).tz_convert("UTC") if end is not None else None)
+        else:
+            window = self.period_window(period)
+
+        plans = await run_io(self._plan_requests, symbols, interval, window)
+        now = time.monotonic()
+        pending: Dict[int, asyncio.Task] = {}
+        to_download: Dict[str, List[FetchKey]] = {}
+
+        for symbol, requests in plans.items():
+            for label, key in requests:
+                fetched_at = self._fetch_cache.get(key)
+                if fetched_at is not None and now - fetched_at < self.cache_ttl:
+                    logger.info(f"Cache hit {symbol} {interval} from {key[2]:%Y-%m-%d %H:%M}")
+                    continue
+
+                task = self._inflight.get(key)
+                if task is None:
+                    to_download.setdefault(label, []).append(key)
+                else:
+                    logger.info(f"Joining in-flight fetch {symbol} {interval} from {key[2]:%Y-%m-%d %H:%M}")
+                    pending[id(task)] = task
+
+        for label, keys in to_download.items():
+            task = asyncio.ensure_future(self._sync_store(label, keys, interval))
+            for key in keys:
+                self._inflight[key] = task
+            pending[id(task)] = task
+        if not any(plans.values()):
+            logger.info(f"Store covers {', '.join(symbols)} {interval} window - no download")
+
+        # Shield so a cancelled caller does not cancel the shared download
+        outcomes = await asyncio.gather(*(asyncio.shield(task) for task in pending.values()), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+        return await run_io(self._read_window, symbols, interval, window)
+
+    async def _sync_store(self, label: str, keys: List[FetchKey], interval: str):
+        """
+        Run one kind of request for a set of single-flight keys and record them as done.
+        Large symbol lists are split into FETCH_BATCH_SIZE requests admitted by the fetch
+        scheduler; the batch holding gold is queued first. A request running to the clock
+        also leaves the store current from its new newest bar, so that resume point is
+        recorded too and the next caller within `cache_ttl` downloads nothing.
+        """
+        try:
+            ordered = sorted(keys, key=lambda key: fetch_priority([key[0]]))
+            batches = [ordered[i:i + FETCH_BATCH_SIZE] for i in range(0, len(ordered), FETCH_BATCH_SIZE)]
+
+            outcomes = await asyncio.gather(
+                *(self._fetch_batch(label, batch, interval) for batch in batches),
+                return_exceptions=True
+            )
+
+            fetched_at = time.monotonic()
+            for batch, outcome in zip(batches, outcomes):
+                if isinstance(outcome, BaseException):
+                    if len(batches) == 1:
+                        raise outcome
+                    logger.error(f"Fetch failed for {', '.join(key[0] for key in batch)} {interval}: {outcome}")
+                    continue
+                for key in batch:
+                    self._fetch_cache[key] = fetched_at
+                    if key[3] is None and key[0] in outcome:
+                        self._fetch_cache[(key[0], interval, outcome[key[0]], None)] = fetched_at
+        finally:
+            for key in keys:
+                self._inflight.pop(key, None)
+
+    @retry_on_failure(max_retries=3, delay=1.0, source=lambda self, *args, **kwargs: self.provider.name)
+    async def _fetch_batch(self, label: str, keys: List[FetchKey], interval: str) -> Dict[str, pd.Timestamp]:
+        """Run one scheduled provider request for a batch of symbols."""
+        symbols = [key[0] for key in keys]
+        async with self.scheduler.slot(self.provider, fetch_priority(symbols), cost=len(symbols)):
+            return await run_io(self._download_sync, label, keys, interval)
+
+    async def check_data_quality(self, symbol: str = "GC=F", interval: str = "5m",
+                                 sessions: int = ANALYSIS_SESSIONS) -> Dict:
+        """Validate the (cached) bars of the analysis window against the CME schedule; see DataQualityValidator."""
+        df = await self.fetch_ohlcv(symbol, interval=interval, start=self.session_window(sessions)[0])
+        return await run_cpu(self.validator.validate, df, interval, symbol)
+
+    async def fetch_resampled(self, symbol: str, interval: str = "1h", period: str = "5d", base_interval: str = "5m",
+                              start: Optional[pd.Timestamp] = None,
+                              end: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+        """Derive coarser bars locally from the (shared) base-interval download instead of a second fetch."""
+        base = await self.fetch_ohlcv(symbol, period=period, interval=base_interval, start=start, end=end)
+
+        if base is None or base.empty:
+            return None
+
+        return await run_cpu(resample_ohlcv, base, interval)
+
+    async def fetch_continuous(self, root: str = "GC", period: str = "1y",
+                               interval: str = "1h") -> Optional[pd.DataFrame]:
+        """
+        Back-adjusted continuous front-month series stitched from individual contracts.
+        Every contract month that could be front over the period is fetched in one batch
+        (through the bar store, so reruns are incremental), rolled by volume and stitched
+        on the CPU pool. The result is cached in the bar store as "<root>=CONT" and served
+        from there while it spans every contract bar; once a contract has newer bars it is
+        rebuilt and rewritten as a whole, since a new roll shifts all history.
+        """
+        now = self.provider.now()
+        offset = period_to_offset(period)
+        start = now - offset if offset is not None else now - pd.DateOffset(years=1)
+        symbols = contract_symbols(start, now, root=root)
+
+        frames = await self.fetch_ohlcv_batch(symbols, period=period, interval=interval)
+        if not frames:
+            logger.warning(f"No {root} contract data for a continuous series")
+            return None
+
+        cont_symbol = f"{root}=CONT"
+        cached = await run_io(self.store.load, cont_symbol, interval)
+        if cached is not None and not cached.empty:
+            earliest = min(df.index[0] for df in frames.values())
+            latest = max(df.index[-1] for df in frames.values())
+            if cached.index[0] <= earliest and cached.index[-1] >= latest:
+                logger.info(f"{cont_symbol} {interval} is current - served from the bar store")
+                return cached[(cached.index >= earliest) & (cached.index <= latest)]
+
+        stitched = await run_cpu(stitch_contracts, {symbol: frames.get(symbol) for symbol in symbols})
+        if stitched.empty:
+            return None
+
+        await run_io(self.store.replace, cont_symbol, interval, stitched)
+        return stitched
+
+    async def fetch_session_candles(self, symbol: str = "GC=F", period: str = "1mo",
+                                    interval: str = "5m", continuous: bool = False,
+                                    start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Fetch bars and build the session-candle table for every CME session in the period.
+        With `continuous`, gold comes from the back-adjusted contract series instead of GC=F.
+        """
+        if continuous and symbol == SYMBOLS["gold"]:
+            df = await self.fetch_continuous(period=period, interval=interval)
+        else:
+            df = await self.fetch_ohlcv(symbol, period=period, interval=interval, start=start)
+
+        if df is None or df.empty:
+            return pd.DataFrame()
+
+        return await run_cpu(build_session_candles, df)
+
+    @staticmethod
+    def _extend_session_atr(cached: Optional[pd.DataFrame], candles: pd.DataFrame, period: int) -> pd.DataFrame:
+        """
+        Append new session candles to the cached table, advancing true range,
+        SMA-ATR and Wilder ATR by one step per candle (no recompute from raw bars).
+        Without a usable cache the whole table is rebuilt with atr_frame.
+        """
+        sma_col, wilder_col = f"atr_sma_{period}", f"atr_wilder_{period}"
+
+        if cached is None or cached.empty or wilder_col not in cached.columns:
+            # Nothing usable cached for this period - rebuild from all known candles
+            if cached is not None and not cached.empty:
+                candles = pd.concat([cached[candles.columns], candles[candles.index > cached.index[-1]]])
+            cached = None
+        else:
+            candles = candles[candles.index > cached.index[-1]]
+
+        if candles.empty:
+            return cached
+
+        if cached is None:
+            # Full rebuild: one vectorized pass over every candle
+            atr = atr_frame(candles, periods=[period], methods=["sma", "wilder"])
+            return candles.assign(tr=atr["tr"], **{sma_col: atr[sma_col], wilder_col: atr[wilder_col]})
+
+        history = deque(cached["tr"].tail(period), maxlen=period)
+        count = len(cached)
+        prev_close = float(cached["close"].iloc[-1])
+        prev_wilder = float(cached[wilder_col].iloc[-1])
+
+        trs, smas, wilders = [], [], []
+        for high, low, close in zip(candles["high"], candles["low"], candles["close"]):
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+            history.append(tr)
+            count += 1
+            sma = sum(history) / period if count >= period else np.nan
+
+            if count == period:
+                wilder = sma  # Wilder seeds with the simple average of the first N ranges
+            elif count > period:
+                wilder = (prev_wilder * (period - 1) + tr) / period
+            else:
+                wilder = np.nan
+
+            trs.append(tr)
+            smas.append(sma)
+            wilders.append(wilder)
+            prev_close, prev_wilder = close, wilder
+
+        extended = candles.assign(tr=trs, **{sma_col: smas, wilder_col: wilders})
+        return pd.concat([cached, extended])
+
+    async def get_session_atr(self, symbol: str = "GC=F", period: int = ATR_PERIOD) -> Optional[Dict[str, float]]:
+        """
+        Rolling N-session true-range ATR (simple and Wilder) from cached session candles.
+        Completed sessions are persisted in the bar store with their ATR state, so a
+        daily run only advances the series by the sessions completed since the last cached
+        one. When the cache is too short to seed the ATR, or ends further back than the
+        provider serves 5m bars, it is rebuilt from 3 months of 1h bars.
+        """
+        cached = await run_io(self.store.load, symbol, "session")
+        if cached is not None:
+            cached = cached[cached.index <= pd.Timestamp(last_completed_session(self.provider.now()))]
+
+        # Resume from the session after the last cached one so downtime leaves no hole in the series
+        start = self.session_window()[0]
+        resumable = cached is not None and len(cached) > period
+        if resumable:
+            resume = session_bounds(cached.index[-1] + pd.offsets.BDay(1))[0].tz_convert("UTC")
+            if self.provider.clip_history("5m", resume)[0][0] > resume:
+                logger.warning(f"{symbol} session cache ends {cached.index[-1]:%Y-%m-%d}, beyond 5m history - rebuilding")
+                cached, resumable = None, False
+            else:
+                start = min(start, resume)
+
+        candles = await self.fetch_session_candles(symbol, interval="5m", start=start)
+
+        if not resumable:
+            logger.info(f"Bootstrapping {symbol} session candles for {period}-session ATR")
+            history = await self.fetch_session_candles(symbol, period="3mo", interval="1h",
+                                                       continuous=USE_CONTINUOUS_CONTRACT)
+            frames = [history, candles]
+            if cached is not None:
+                frames.insert(0, cached[candles.columns])
+            candles = pd.concat([f for f in frames if not f.empty])
+            candles = candles[~candles.index.duplicated(keep="last")].sort_index()
+            cached = None  # Rebuild the ATR state over the longer history
+
+        if candles.empty and cached is None:
+            return None
+
+        # Only completed sessions enter the cache; the developing one would be half a range
+        now = self.provider.now().tz_convert(ET_TZ)
+        completed = [session_bounds(day)[1] <= now for day in candles.index]
+        candles = candles[completed]
+
+        table = await run_cpu(self._extend_session_atr, cached, candles, period)
+
+        if table is None or table.empty:
+            return None
+
+        if cached is None or len(table) != len(cached):
+            await run_io(self.store.append, symbol, "session", table)
+
+        latest = table.iloc[-1]
+        sma = latest[f"atr_sma_{period}"]
+        wilder = latest[f"atr_wilder_{period}"]
+
+        return {
+            "period": period,
+            "session_date": table.index[-1].strftime("%Y-%m-%d"),
+            "sessions": len(table),
+            "atr_sma": round(float(sma), 2) if pd.notna(sma) else None,
+            "atr_wilder": round(float(wilder), 2) if pd.notna(wilder) else None,
+        }
+
+    async def get_composite_profiles(self, symbol: str = "GC=F", windows: List[int] = COMPOSITE_PROFILE_SESSIONS,
+                                     tick_size: float = PROFILE_TICK_SIZE) -> Dict[str, Dict]:
+        """
+        Composite volume profiles (VPOC/VAH/VAL) over the last N completed sessions for each N in `windows`.
+        Completed sessions' tick histograms are persisted, so a run only profiles the 5m bars of
+        sessions newer than the last stored one (normally just yesterday's) and advances each
+        composite by adding that session and dropping the one that left its window. Sessions
+        the 5m history only partly covers are never stored, and a window is reported only once
+        it holds N sessions.
+        """
+        key = (symbol, tick_size)
+        if key not in self._session_histograms:
+            self._session_histograms[key] = await run_io(self.profile_store.load, symbol, tick_size)
+        now = self.provider.now()
+        last = last_completed_session(now)
+        stored_histograms = self._session_histograms[key]
+        # Sessions past the provider clock stay in the store but are never visible to this run
+        histograms = {d: h for d, h in stored_histograms.items() if d <= last}
+        newest = max(histograms) if histograms else None
+
+        if newest is None or newest < last:
+            if newest is None:
+                start = sessions_start(max(windows), now)
+            else:
+                start = session_bounds(newest + timedelta(days=1))[0].tz_convert("UTC")
+            # After downtime longer than the 5m history the first fetched session is partial too
+            start = self.provider.clip_history("5m", start)[0][0]
+            bars = await self.fetch_ohlcv(symbol, interval="5m", start=start)
+            new = await run_cpu(session_tick_histograms, bars, tick_size, last, start)
+            new = {d: h for d, h in new.items() if newest is None or d > newest}
+            if new:
+                histograms.update(new)
+                stored_histograms.update(new)
+                await run_io(self.profile_store.save, symbol, tick_size, stored_histograms)
+                logger.info(f"Profiled {len(new)} new {symbol} sessions ({len(stored_histograms)} stored)")
+
+        stored = sorted(histograms)
+        results = {}
+        for window in windows:
+            composite = self._composites.get((symbol, tick_size, window))
+            if composite is None:
+                composite = self._composites[(symbol, tick_size, window)] = CompositeProfile(window, tick_size)
+            for session_date in stored[-window:]:
+                composite.add(session_date, *histograms[session_date])
+
+            if len(composite) < window:
+                logger.info(f"{symbol} {window}-session composite skipped - only {len(composite)} sessions stored")
+                continue
+            profile = composite.profile()
+            if len(profile) == 0:
+                continue
+            val, vah = profile.value_area()
+            results[f"{window}_session"] = {
+                "sessions": len(composite),
+                "first_session": composite.first_session.isoformat(),
+                "last_session": composite.last_session.isoformat(),
+                "vpoc": profile.vpoc,
+                "vah": vah,
+                "val": val,
+            }
+        return results
 
     async def get_correlations(self) -> pd.DataFrame:
         """Fetch Gold, DXY, US10Y and return correlation matrix with aligned timestamps."""
-        tasks = [self.fetch_ohlcv(symbol, period="5d", interval="1h") for symbol in SYMBOLS.values()]
-        dataframes = await asyncio.gather(*tasks)
+        # Gold 1h is derived from the 5m session download; the other symbols share one batched 1h request
+        macro_symbols = [symbol for name, symbol in SYMBOLS.items() if name != "gold"]
+        start, _ = self.session_window()
+        gold_hourly, macro_frames = await asyncio.gather(
+            self.fetch_resampled(SYMBOLS["gold"], interval="1h", start=start),
+            self.fetch_ohlcv_batch(macro_symbols, interval="1h", start=start),
+        )
+        dataframes = [
+            gold_hourly if name == "gold" else macro_frames.get(symbol)
+            for name, symbol in SYMBOLS.items()
+        ]
 
         valid_data = [
             (name, df) 
@@ -221,13 +816,58 @@ class MarketData:
             logger.warning(f"Insufficient aligned data points for correlation ({len(closes)} points)")
             return pd.DataFrame()
 
-        correlation_matrix = closes.corr()
-        return correlation_matrix
+        return self._update_correlation(closes)
 
-    def calc_volatility_levels(self, session_data: Dict, event_context: Dict = None) -> Dict[str, float]:
+    async def get_multi_horizon_correlations(self, bar_sizes: List[str] = CORRELATION_BAR_SIZES,
+                                             windows: List[str] = CORRELATION_HORIZON_WINDOWS,
+                                             period: str = "3mo") -> Optional[Dict]:
+        """
+        Return-correlation matrices for every bar size x window, stacked as a 3-D array.
+        All symbols share one batched 1h download (the same request the ATR bootstrap
+        makes for gold); coarser bar sizes are resampled locally.
+        Result: {"symbols", "horizons" (e.g. "4h/20d"), "correlations" (H x k x k), "observations"}.
+        """
+        frames = await self.fetch_ohlcv_batch(list(SYMBOLS.values()), period=period, interval="1h")
+        hourly = {name.upper(): frames.get(symbol) for name, symbol in SYMBOLS.items()}
+        if USE_CONTINUOUS_CONTRACT:
+            # Roll gaps in GC=F would show up as spurious gold returns
+            hourly["GOLD"] = await self.fetch_continuous(period=period, interval="1h")
+        hourly = {name: df for name, df in hourly.items() if df is not None and not df.empty}
+
+        if len(hourly) < 2:
+            logger.warning("Insufficient data for multi-horizon correlations")
+            return None
+
+        return await run_cpu(horizon_correlations, hourly, bar_sizes, windows)
+
+    def _update_correlation(self, closes: pd.DataFrame, window: int = CORRELATION_WINDOW) -> pd.DataFrame:
+        """
+        Feed aligned closes into the rolling correlation engine and return its matrix.
+        Only rows at or after the last one already fed are applied (the newest bar is
+        re-fed since it may still have been forming), so intraday refreshes cost
+        O(k²) per new bar.
+        """
+        names = list(closes.columns)
+        if self._correlation is None or self._correlation.names != names or self._correlation.window != window:
+            self._correlation = RollingCorrelation(names, window)
+
+        engine = self._correlation
+        if engine.last_timestamp is not None:
+            closes = closes[closes.index >= engine.last_timestamp]
+
+        for timestamp, row in zip(closes.index, closes.to_numpy(dtype=np.float64)):
+            engine.update(row, timestamp)
+
+        return engine.matrix()
+
+    def calc_volatility_levels(self, session_data: Dict, event_context: Dict = None,
+                               session_atr: Optional[Dict] = None,
+                               volatility_source: str = VOLATILITY_SOURCE) -> Dict[str, float]:
         """
         Calculate volatility-based sigma levels from session data.
         Automatically expands bands on event days (CPI, NFP, FOMC, PCE).
+        `volatility_source` selects the band width: "session_range" (last session only),
+        "atr_sma" or "atr_wilder" (from get_session_atr); falls back to the range if the ATR is unavailable.
         """
         if not session_data:
             logger.warning("No session data for volatility calculation")
@@ -241,9 +881,15 @@ class MarketData:
         if session_close == 0:
             return {}
         
-        # Calculate session range as ATR proxy
         session_range = session_high - session_low
-        daily_atr = session_range  # Use session range as ATR estimate
+        daily_atr = session_range  # Session range as ATR proxy unless a real ATR is selected
+
+        atr_value = (session_atr or {}).get(volatility_source) if volatility_source != "session_range" else None
+        if atr_value:
+            daily_atr = atr_value
+        elif volatility_source != "session_range":
+            logger.warning(f"{volatility_source} unavailable - falling back to session range")
+            volatility_source = "session_range"
         
         # Check for event day volatility expansion
         is_event_day = False
@@ -261,15 +907,15 @@ class MarketData:
         # Calculate sigma based on regime
         # Normal: 1σ = 0.5 * ATR, 2σ = 1.0 * ATR
         # Event: Apply K-Factor expansion
-        base_sigma = session_range * 0.5
+        base_sigma = daily_atr * 0.5
         
         if is_event_day:
             # Expand bands using K-Factor
             sigma_1 = base_sigma * k_factor
-            sigma_2 = (session_range * 1.0) * k_factor
+            sigma_2 = (daily_atr * 1.0) * k_factor
         else:
             sigma_1 = base_sigma
-            sigma_2 = session_range * 1.0
+            sigma_2 = daily_atr * 1.0
         
         levels = {
             "regime": regime,
@@ -284,13 +930,14 @@ class MarketData:
             "vwap": round(session_data.get("vwap", pivot), 1),
             "session_range": round(session_range, 1),
             "daily_atr": round(daily_atr, 1),
+            "volatility_source": volatility_source,
             "is_event_day": is_event_day,
             "event_code": event_code
         }
         
         if is_event_day:
             logger.info(f"📊 EVENT BANDS: {levels['2_sigma_down']:.1f} ← PIVOT {pivot:.1f} → {levels['2_sigma_up']:.1f}")
-            logger.info(f"   Normal bands would be: {round(pivot - session_range, 1)} to {round(pivot + session_range, 1)}")
+            logger.info(f"   Normal bands would be: {round(pivot - daily_atr, 1)} to {round(pivot + daily_atr, 1)}")
 
         return levels
 
@@ -0,0 +1,139 @@
+import logging
+import re
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from src.config import (DQ_MAX_MISSING_RATIO, DQ_MAX_OUTLIERS, DQ_OUTLIER_MAD_Z, DQ_STALE_RUN_BARS,
+                        DQ_ZERO_VOLUME_RUN_BARS)
+from src.session_calendar import CME_SESSION_END_HOUR, CME_SESSION_START_HOUR, ET_TZ
+
+logger = logging.getLogger(__name__)
+
+# MAD -> standard deviation for normally distributed returns
+MAD_SCALE = 0.6745
+
+
+def interval_to_timedelta(interval: str) -> Optional[pd.Timedelta]:
+    """Bar spacing of a provider interval ("5m", "1h", "1d"); None if not a fixed spacing."""
+    match = re.fullmatch(r"(\d+)(m|h|d)", interval or "")
+    if not match:
+        return None
+    unit = {"m": "min", "h": "h", "d": "D"}[match.group(2)]
+    return pd.Timedelta(int(match.group(1)), unit=unit)
+
+
+def cme_open_mask(timestamps: pd.DatetimeIndex) -> np.ndarray:
+    """
+    True where Globex metals trade: Sunday 18:00 ET to Friday 17:00 ET, less the daily
+    17:00-18:00 ET maintenance break. Exchange holidays are not modelled.
+    """
+    wall = timestamps.tz_convert(ET_TZ)
+    hour = wall.hour.to_numpy()
+    weekday = wall.weekday.to_numpy()  # Monday=0
+
+    in_break = (hour >= CME_SESSION_END_HOUR) & (hour < CME_SESSION_START_HOUR)
+    closed = (
+        (weekday == 5)
+        | ((weekday == 4) & (hour >= CME_SESSION_END_HOUR))
+        | ((weekday == 6) & (hour < CME_SESSION_START_HOUR))
+    )
+    return ~(in_break | closed)
+
+
+def _runs(flags: np.ndarray, min_length: int) -> np.ndarray:
+    """Lengths of consecutive True runs that are at least `min_length` long."""
+    padded = np.concatenate(([False], flags, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    lengths = edges[1::2] - edges[::2]
+    return lengths[lengths >= min_length]
+
+
+class DataQualityValidator:
+    """
+    Vectorized checks on a bar frame before analysis: missing bars against the CME
+    schedule, bars with missing prices, stale (repeated) bars, zero-volume stretches
+    and return spikes.
+    Each check is a handful of array passes, so multi-year frames cost milliseconds.
+    """
+
+    def __init__(self, max_missing_ratio: float = DQ_MAX_MISSING_RATIO, stale_run_bars: int = DQ_STALE_RUN_BARS,
+                 zero_volume_run_bars: int = DQ_ZERO_VOLUME_RUN_BARS, outlier_z: float = DQ_OUTLIER_MAD_Z,
+                 max_outliers: int = DQ_MAX_OUTLIERS):
+        self.max_missing_ratio = max_missing_ratio
+        self.stale_run_bars = stale_run_bars
+        self.zero_volume_run_bars = zero_volume_run_bars
+        self.outlier_z = outlier_z
+        self.max_outliers = max_outliers
+
+    def _missing_bars(self, index: pd.DatetimeIndex, spacing: pd.Timedelta) -> Dict:
+        """Compare bars against every open-market slot between the first and last bar."""
+        expected = pd.date_range(index[0], index[-1], freq=spacing)
+        expected = expected[cme_open_mask(expected)]
+
+        present = np.isin(expected.as_unit("ns").asi8, index.as_unit("ns").asi8)
+        missing = int((~present).sum())
+        largest_gap = _runs(~present, 1)
+
+        return {
+            "expected_bars": len(expected),
+            "missing_bars": missing,
+            "missing_ratio": round(missing / len(expected), 4) if len(expected) else 0.0,
+            "largest_gap_minutes": int(largest_gap.max() * spacing.total_seconds() / 60) if len(largest_gap) else 0,
+        }
+
+    def validate(self, df: Optional[pd.DataFrame], interval: str, symbol: str = "") -> Dict:
+        """Return quality metrics and a pass/fail verdict for one bar frame."""
+        if df is None or df.empty or "close" not in df.columns:
+            return {"symbol": symbol, "interval": interval, "bars": 0, "passed": False, "issues": ["no data"]}
+
+        close = df["close"].to_numpy(dtype=np.float64)
+        metrics = {"symbol": symbol, "interval": interval, "bars": len(df)}
+        issues: List[str] = []
+
+        spacing = interval_to_timedelta(interval)
+        if spacing is not None and spacing < pd.Timedelta(days=1) and len(df) > 1:
+            metrics.update(self._missing_bars(df.index, spacing))
+            if metrics["missing_ratio"] > self.max_missing_ratio:
+                issues.append(f"{metrics['missing_bars']} missing bars ({metrics['missing_ratio']:.1%})")
+
+        price_columns = [col for col in ("open", "high", "low", "close") if col in df.columns]
+        prices = df[price_columns].to_numpy(dtype=np.float64)
+        metrics["missing_price_bars"] = int(np.isnan(prices).any(axis=1).sum())
+        if metrics["missing_price_bars"] > self.max_missing_ratio * len(df):
+            issues.append(f"{metrics['missing_price_bars']} bars with missing prices")
+
+        # Stale: bars repeating every price of the previous bar, as a feed copying its last bar does
+        repeated = np.zeros(len(close), dtype=bool)
+        repeated[1:] = (prices[1:] == prices[:-1]).all(axis=1)
+        stale_runs = _runs(repeated, self.stale_run_bars)
+        metrics["stale_runs"] = len(stale_runs)
+        metrics["stale_bars"] = int(stale_runs.sum())
+        if len(stale_runs):
+            issues.append(f"{len(stale_runs)} stale price runs (longest {stale_runs.max()} bars)")
+
+        if "volume" in df.columns:
+            zero_runs = _runs(df["volume"].to_numpy() == 0, self.zero_volume_run_bars)
+            metrics["zero_volume_runs"] = len(zero_runs)
+            metrics["zero_volume_bars"] = int(zero_runs.sum())
+            if len(zero_runs):
+                issues.append(f"{len(zero_runs)} zero-volume stretches (longest {zero_runs.max()} bars)")
+
+        # Spikes: log returns far outside the median absolute deviation
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.diff(np.log(close))
+        returns = returns[np.isfinite(returns)]
+        if len(returns) > 2:
+            deviation = np.abs(returns - np.median(returns))
+            mad = np.median(deviation)
+            robust_z = MAD_SCALE * deviation / mad if mad > 0 else np.zeros_like(deviation)
+            metrics["outliers"] = int((robust_z > self.outlier_z).sum())
+            metrics["max_robust_z"] = round(float(robust_z.max()), 2)
+            if metrics["outliers"] > self.max_outliers:
+                issues.append(f"{metrics['outliers']} price spikes (max robust z {metrics['max_robust_z']})")
+
+        metrics["passed"] = not issues
+        metrics["issues"] = issues
+
+        if issues:
+            logger.warning(f"Data quality {symbol} {interval}: {'; '.join(issues)}")
+        return metrics
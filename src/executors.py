@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Callable, Dict, Optional
+from src.config import CPU_WORKERS, IO_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+def _process_context():
+    """
+    forkserver where the platform has it, else spawn. Workers are started after the event
+    loop and the I/O threads are running; forking such a process can deadlock the child.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def _init_worker(level: int, fmt: Optional[str]):
+    """Fresh worker processes do not inherit logging setup; mirror the parent's level and format."""
+    logging.basicConfig(level=level, format=fmt)
+
+
+def _logging_setup():
+    root = logging.getLogger()
+    formatter = root.handlers[0].formatter if root.handlers else None
+    return root.level, formatter._fmt if formatter is not None else None
+
+
+class BoundedExecutor:
+    """
+    A sized pool with queue-depth metrics.
+    `run` awaits a blocking call on the pool. In-flight jobs beyond `max_workers`
+    are queued; the peak queue depth and the time jobs spent queued (thread pools
+    only, where the start of a job is observable) show when a pool is undersized.
+    A process pool broken by a dead worker is replaced and the job resubmitted once.
+    """
+
+    def __init__(self, name: str, max_workers: int, processes: bool = False):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.processes = processes
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.rebuilds = 0
+        self.total_queue_wait = 0.0
+
+    @property
+    def pool(self) -> Executor:
+        if self._pool is None:
+            if self.processes:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_process_context(),
+                                                 initializer=_init_worker, initargs=_logging_setup())
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        return self._pool
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.max_workers)
+
+    def _timed(self, func: Callable, submitted: float):
+        """Thread-side wrapper recording how long the job waited for a worker."""
+        waited = time.monotonic() - submitted
+        with self._lock:
+            self.total_queue_wait += waited
+        return func()
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """Run `func(*args, **kwargs)` on the pool and await its result."""
+        call = partial(func, *args, **kwargs)
+        if not self.processes:
+            call = partial(self._timed, call, time.monotonic())
+
+        with self._lock:
+            self.in_flight += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+        try:
+            pool = self.pool
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(pool, call)
+            except BrokenProcessPool as e:
+                logger.warning(f"{self.name} pool broken ({e}) - rebuilding and resubmitting")
+                self._discard(pool)
+                result = await asyncio.get_running_loop().run_in_executor(self.pool, call)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def _discard(self, pool: Executor):
+        """Drop a broken pool so the next access builds a fresh one (once, however many jobs saw it break)."""
+        with self._lock:
+            if self._pool is not pool:
+                return
+            self._pool = None
+            self.rebuilds += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def metrics(self) -> Dict:
+        finished = self.completed + self.failed
+        metrics = {
+            "workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+        if self.processes:
+            metrics["rebuilds"] = self.rebuilds
+        if not self.processes:
+            metrics["avg_queue_wait_ms"] = round(1000 * self.total_queue_wait / finished, 1) if finished else 0.0
+        return metrics
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Network and disk calls (downloads, bar store reads/writes)
+io_executor = BoundedExecutor("io", IO_WORKERS)
+# CPU-heavy analytics on picklable module-level functions (CSV parsing, resampling, validation)
+cpu_executor = BoundedExecutor("cpu", CPU_WORKERS, processes=True)
+
+
+async def run_io(func: Callable, *args, **kwargs):
+    """Run a blocking network/disk call on the I/O thread pool."""
+    return await io_executor.run(func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable, *args, **kwargs):
+    """Run a picklable CPU-bound function on the process pool."""
+    return await cpu_executor.run(func, *args, **kwargs)
+
+
+def executor_metrics() -> Dict[str, Dict]:
+    return {"io": io_executor.metrics(), "cpu": cpu_executor.metrics()}
+
+
+def shutdown_executors():
+    io_executor.shutdown()
+    cpu_executor.shutdown()
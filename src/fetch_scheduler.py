@@ -0,0 +1,107 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from src.config import MAX_CONCURRENT_FETCHES, SYMBOLS
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_GOLD = 0
+PRIORITY_DEFAULT = 10
+
+
+def fetch_priority(symbols: List[str]) -> int:
+    """Lower runs first: any request that includes gold jumps the queue."""
+    return PRIORITY_GOLD if SYMBOLS["gold"] in symbols else PRIORITY_DEFAULT
+
+
+class TokenBucket:
+    """Request rate limiter: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 1):
+        """Wait until `tokens` are available (capped at the burst size) and take them."""
+        tokens = min(tokens, self.burst)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class FetchScheduler:
+    """
+    Admits provider requests by priority with a global concurrency limit.
+    A caller holds a slot for the duration of its request; freed slots go to the
+    highest-priority waiter (FIFO within a priority). Providers that declare a
+    `rate_limit` additionally draw from a per-provider token bucket, charged one
+    token per symbol since Yahoo issues one HTTP request per ticker.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_FETCHES):
+        self.max_concurrent = max(1, max_concurrent)
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    async def _acquire(self, priority: int):
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before cancellation
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        """Hand the slot to the next live waiter, or free it."""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def _bucket(self, provider) -> Optional[TokenBucket]:
+        rate_limit = getattr(provider, "rate_limit", None)
+        if rate_limit is None:
+            return None
+        if provider.name not in self._buckets:
+            self._buckets[provider.name] = TokenBucket(*rate_limit)
+        return self._buckets[provider.name]
+
+    @asynccontextmanager
+    async def slot(self, provider, priority: int = PRIORITY_DEFAULT, cost: int = 1) -> AsyncIterator[None]:
+        """Hold one concurrency slot (and `cost` rate-limit tokens) for a provider request."""
+        queued_at = time.monotonic()
+        await self._acquire(priority)
+        try:
+            bucket = self._bucket(provider)
+            if bucket is not None:
+                await bucket.acquire(cost)
+            waited = time.monotonic() - queued_at
+            if waited > 1.0:
+                logger.info(f"Fetch slot granted after {waited:.1f}s (priority {priority}, {len(self._waiters)} queued)")
+            yield
+        finally:
+            self._release()
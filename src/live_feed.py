@@ -0,0 +1,211 @@
+import asyncio
+import csv
+import json
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+import pandas as pd
+from src.session_calendar import ET_TZ, session_bounds, session_date_for
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_bar(raw: Dict) -> Optional[Dict]:
+    """Coerce a raw feed record into a bar dict with a UTC timestamp; None if malformed."""
+    try:
+        ts = pd.Timestamp(raw["timestamp"])
+        return {
+            "timestamp": ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC"),
+            "open": float(raw["open"]),
+            "high": float(raw["high"]),
+            "low": float(raw["low"]),
+            "close": float(raw["close"]),
+            "volume": float(raw.get("volume") or 0),
+        }
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Skipping malformed bar {raw!r}: {e}")
+        return None
+
+
+class BarFeed(ABC):
+    """Source of live bars, delivered one at a time."""
+
+    @abstractmethod
+    def bars(self) -> AsyncIterator[Dict]:
+        """Yield bar dicts (timestamp, open, high, low, close, volume) as they arrive."""
+
+
+class FileTailFeed(BarFeed):
+    """
+    Tails a CSV file (header: timestamp,open,high,low,close,volume) and yields
+    rows as they are appended, like `tail -f`. Stand-in for a vendor feed.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 1.0, from_start: bool = False):
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.from_start = from_start
+
+    async def bars(self) -> AsyncIterator[Dict]:
+        while not self.path.exists():
+            await asyncio.sleep(self.poll_interval)
+
+        with open(self.path, "r", newline="") as f:
+            header = next(csv.reader([f.readline()]))
+            if not self.from_start:
+                f.seek(0, 2)
+
+            pending = ""
+            while True:
+                chunk = f.readline()
+                if not chunk:
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                # A writer may flush half a line; wait for the newline
+                pending += chunk
+                if not pending.endswith("\n"):
+                    continue
+
+                row = next(csv.reader([pending]))
+                pending = ""
+                bar = _parse_bar(dict(zip(header, row)))
+                if bar is not None:
+                    yield bar
+
+
+class SocketFeed(BarFeed):
+    """Reads newline-delimited JSON bars from a TCP socket, reconnecting on drop."""
+
+    def __init__(self, host: str, port: int, reconnect_delay: float = 5.0):
+        self.host = host
+        self.port = port
+        self.reconnect_delay = reconnect_delay
+
+    async def bars(self) -> AsyncIterator[Dict]:
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+                logger.info(f"Live feed connected to {self.host}:{self.port}")
+                try:
+                    while line := await reader.readline():
+                        try:
+                            bar = _parse_bar(json.loads(line))
+                        except json.JSONDecodeError as e:
+                            logger.warning(f"Skipping non-JSON feed line: {e}")
+                            continue
+                        if bar is not None:
+                            yield bar
+                finally:
+                    writer.close()
+            except OSError as e:
+                logger.warning(f"Live feed {self.host}:{self.port} unavailable: {e}")
+
+            await asyncio.sleep(self.reconnect_delay)
+
+
+def make_feed(spec: str) -> BarFeed:
+    """Build a feed from a LIVE_FEED spec: "file:<path>" or "socket:<host>:<port>"."""
+    kind, _, target = spec.partition(":")
+    if kind == "file":
+        return FileTailFeed(target)
+    if kind == "socket":
+        host, _, port = target.rpartition(":")
+        return SocketFeed(host or "127.0.0.1", int(port))
+    raise ValueError(f"Unknown live feed spec: {spec}")
+
+
+class SessionAccumulator:
+    """
+    Running CME session aggregates with constant work per bar.
+    Completed bars are folded into running totals; the newest bar is held
+    separately so a feed may resend it with revised values while it forms.
+    Rolls over automatically when a bar from the next session arrives.
+    """
+
+    def __init__(self):
+        self.session_date = None
+        self._reset()
+
+    def _reset(self):
+        self.open = None
+        self.high = float("-inf")
+        self.low = float("inf")
+        self.volume = 0.0
+        self.pv_sum = 0.0   # Sum(Typical Price * Volume)
+        self.tp_sum = 0.0   # Sum(Typical Price), for the zero-volume VWAP fallback
+        self.bars = 0
+        self.first_bar_time = None
+        self._current = None
+
+    def _fold_current(self):
+        bar = self._current
+        typical_price = (bar["high"] + bar["low"] + bar["close"]) / 3
+        self.high = max(self.high, bar["high"])
+        self.low = min(self.low, bar["low"])
+        self.volume += bar["volume"]
+        self.pv_sum += typical_price * bar["volume"]
+        self.tp_sum += typical_price
+        self.bars += 1
+        self._current = None
+
+    def update(self, bar: Dict):
+        """Apply one bar (a repeat of the newest timestamp replaces it)."""
+        session_date = session_date_for(bar["timestamp"])
+
+        if session_date != self.session_date:
+            if self.session_date is not None and session_date < self.session_date:
+                logger.warning(f"Ignoring bar from earlier session {session_date}")
+                return
+            self.session_date = session_date
+            self._reset()
+
+        if self._current is not None:
+            if bar["timestamp"] < self._current["timestamp"]:
+                logger.warning(f"Ignoring out-of-order bar {bar['timestamp']}")
+                return
+            if bar["timestamp"] > self._current["timestamp"]:
+                self._fold_current()
+
+        if self.open is None:
+            self.open = bar["open"]
+            self.first_bar_time = bar["timestamp"]
+        self._current = bar
+
+    @property
+    def last_bar_time(self) -> Optional[pd.Timestamp]:
+        return self._current["timestamp"] if self._current is not None else None
+
+    def snapshot(self) -> Optional[Dict]:
+        """Developing session candle in the same shape (and ET bar times) as MarketData.fetch_session_ohlcv."""
+        if self._current is None:
+            return None
+
+        bar = self._current
+        typical_price = (bar["high"] + bar["low"] + bar["close"]) / 3
+        high = max(self.high, bar["high"])
+        low = min(self.low, bar["low"])
+        close = bar["close"]
+        volume = self.volume + bar["volume"]
+        bars = self.bars + 1
+
+        vwap = (self.pv_sum + typical_price * bar["volume"]) / volume if volume > 0 else (self.tp_sum + typical_price) / bars
+        session_start, session_end = session_bounds(self.session_date)
+
+        return {
+            "session_start": session_start.isoformat(),
+            "session_end": session_end.isoformat(),
+            "session_date": self.session_date.strftime('%Y-%m-%d'),
+            "open": round(self.open, 2),
+            "high": round(high, 2),
+            "low": round(low, 2),
+            "close": round(close, 2),
+            "volume": round(volume, 0),
+            "vwap": round(vwap, 2),
+            "pivot": round((high + low + close) / 3, 2),
+            "bars_in_session": bars,
+            "first_bar_time": str(self.first_bar_time.tz_convert(ET_TZ)),
+            "last_bar_time": str(bar["timestamp"].tz_convert(ET_TZ)),
+            "developing": True
+        }
@@ -1,9 +1,9 @@
 import logging
 import json
-import asyncio
 from openai import AsyncOpenAI
 from typing import Dict
 from src.config import OPENROUTER_API_KEY, OPENROUTER_MODEL, SITE_URL, SITE_NAME
+from src.resilience import retry_on_failure
 
 logger = logging.getLogger(__name__)
 
@@ -176,34 +176,29 @@ class ReasoningCore:
             market_data=json.dumps(market_data_dict, indent=2, default=str)
         )
 
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = await self.client.chat.completions.create(
-                    model=OPENROUTER_MODEL,
-                    messages=[
-                        {"role": "system", "content": INSTITUTIONAL_SYSTEM_PROMPT},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=2500
-                )
-
-                report = response.choices[0].message.content
-                if not report:
-                    return "# ⚠️ Error: Empty response from LLM"
-                
-                # Append TradingView data section
-                tradingview_data = self._format_tradingview_data(market_data_dict)
-                report = f"{report}{tradingview_data}"
-                
-                return report
-
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    logger.error(f"Error generating report after {max_retries} attempts: {e}")
-                    return f"# ⚠️ Error generating report: {str(e)}"
-                logger.warning(f"LLM request failed (attempt {attempt + 1}/{max_retries}): {e}. Retrying...")
-                await asyncio.sleep(2 * (attempt + 1))
-        
-        return "# ⚠️ Error: Failed to generate report after retries"
+        try:
+            report = await self._complete(user_prompt)
+        except Exception as e:
+            logger.error(f"Error generating report: {e}")
+            return f"# ⚠️ Error generating report: {str(e)}"
+
+        if not report:
+            return "# ⚠️ Error: Empty response from LLM"
+
+        # Append TradingView data section
+        tradingview_data = self._format_tradingview_data(market_data_dict)
+        return f"{report}{tradingview_data}"
+
+    @retry_on_failure(max_retries=3, delay=2.0, source="openrouter")
+    async def _complete(self, user_prompt: str) -> str:
+        """One chat completion request; retried with backoff behind the OpenRouter circuit breaker."""
+        response = await self.client.chat.completions.create(
+            model=OPENROUTER_MODEL,
+            messages=[
+                {"role": "system", "content": INSTITUTIONAL_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.7,
+            max_tokens=2500
+        )
+        return response.choices[0].message.content
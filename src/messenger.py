@@ -2,6 +2,7 @@ import logging
 import requests
 from typing import Optional
 from src.config import DISCORD_WEBHOOK_URL
+from src.resilience import retry_on_failure_sync
 
 logger = logging.getLogger(__name__)
 
@@ -54,26 +55,20 @@ class DiscordBot:
 
     def _send_chunk(self, content: str, chunk_num: Optional[int] = None, total: Optional[int] = None) -> bool:
         """Send a single chunk to Discord with retry logic."""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                if chunk_num and total:
-                    header = f"**Part {chunk_num}/{total}**\n\n"
-                    content_with_header = header + content
-                else:
-                    content_with_header = content
+        if chunk_num and total:
+            header = f"**Part {chunk_num}/{total}**\n\n"
+            content = header + content
+
+        try:
+            self._post({"content": content})
+        except Exception as e:
+            logger.error(f"Error sending message to Discord: {e}")
+            return False
 
-                payload = {"content": content_with_header}
-                response = requests.post(self.webhook_url, json=payload, timeout=10)
-                response.raise_for_status()
-                logger.info(f"Successfully sent message to Discord (chunk {chunk_num}/{total if chunk_num else 'single'})")
-                return True
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    logger.error(f"Error sending message to Discord after {max_retries} attempts: {e}")
-                    return False
-                logger.warning(f"Discord send failed (attempt {attempt + 1}/{max_retries}): {e}. Retrying...")
-                import time
-                time.sleep(1 * (attempt + 1))
-        return False
+        logger.info(f"Successfully sent message to Discord (chunk {chunk_num}/{total if chunk_num else 'single'})")
+        return True
 
+    @retry_on_failure_sync(max_retries=3, delay=1.0, source="discord")
+    def _post(self, payload: dict):
+        response = requests.post(self.webhook_url, json=payload, timeout=10)
+        response.raise_for_status()
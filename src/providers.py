@@ -0,0 +1,258 @@
+import logging
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+import yfinance as yf
+from src.bar_store import safe_name
+from src.config import MARKET_DATA_PROVIDER, REPLAY_AS_OF, REPLAY_DATA_DIR, YAHOO_REQUEST_BURST, YAHOO_REQUESTS_PER_SECOND
+
+logger = logging.getLogger(__name__)
+
+# A request span [start, end); an end of None runs up to the provider clock
+Chunk = Tuple[pd.Timestamp, Optional[pd.Timestamp]]
+
+# Maximum history Yahoo serves per intraday interval; older gaps need a full re-download
+YAHOO_INTERVAL_LIMITS = {
+    "1m": timedelta(days=7),
+    "2m": timedelta(days=60),
+    "5m": timedelta(days=60),
+    "15m": timedelta(days=60),
+    "30m": timedelta(days=60),
+    "60m": timedelta(days=730),
+    "1h": timedelta(days=730),
+    "90m": timedelta(days=60),
+}
+
+
+def period_to_offset(period: str) -> Optional[pd.DateOffset]:
+    """Translate a Yahoo period string ("5d", "1mo", "1y") into a pandas offset. "d" counts trading days."""
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period or "")
+    if not match:
+        return None
+
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return pd.offsets.BDay(count)
+    if unit == "wk":
+        return pd.DateOffset(weeks=count)
+    if unit == "mo":
+        return pd.DateOffset(months=count)
+    return pd.DateOffset(years=count)
+
+
+def _to_utc(ts) -> pd.Timestamp:
+    """Timestamp in UTC; naive values are taken as UTC."""
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+
+def _standardize_frame(bars: pd.DataFrame) -> pd.DataFrame:
+    """Lowercase columns and a UTC index named "timestamp". Gaps are left for DataQualityValidator to report."""
+    bars.columns = bars.columns.str.lower()
+
+    if bars.index.tz is None:
+        bars.index = bars.index.tz_localize("UTC")
+    bars.index = bars.index.tz_convert("UTC")
+    bars.index.name = "timestamp"
+
+    return bars
+
+
+# Widest start/end span Yahoo accepts in one intraday request
+YAHOO_REQUEST_SPANS = {
+    "1m": timedelta(days=7),
+    "2m": timedelta(days=59),
+    "5m": timedelta(days=59),
+    "15m": timedelta(days=59),
+    "30m": timedelta(days=59),
+    "60m": timedelta(days=365),
+    "1h": timedelta(days=365),
+    "90m": timedelta(days=59),
+}
+
+
+class MarketDataProvider(ABC):
+    """Source of OHLCV bars for MarketData."""
+
+    name = "base"
+    # Maximum history served per interval; intervals not listed are unlimited
+    interval_limits: Dict[str, timedelta] = {}
+    # Widest span a single request may cover; intervals not listed are unlimited
+    request_spans: Dict[str, timedelta] = {}
+    # (requests per second, burst) enforced by FetchScheduler; None means unlimited
+    rate_limit: Optional[Tuple[float, int]] = None
+
+    def now(self) -> pd.Timestamp:
+        """Current time as seen by this provider (UTC)."""
+        return pd.Timestamp.now(tz="UTC")
+
+    def clip_history(self, interval: str, start: pd.Timestamp, end: Optional[pd.Timestamp] = None,
+                     default_span: Optional[timedelta] = None) -> List[Chunk]:
+        """
+        Split [start, end) into request spans this provider accepts, with `start` clipped
+        to the history it serves at `interval` (so chunks[0][0] is the usable start).
+        Intervals without a request span use `default_span`, or one request if None.
+        """
+        limit = self.interval_limits.get(interval)
+        if limit is not None:
+            earliest = (self.now() - limit + pd.Timedelta(days=1)).floor("D")
+            if start < earliest:
+                logger.warning(f"{interval} history only reaches {earliest:%Y-%m-%d} - clipping start")
+                start = earliest
+
+        span = self.request_spans.get(interval, default_span)
+        stop = end if end is not None else self.now()
+        starts = [start]
+        if span is not None:
+            span = pd.Timedelta(span)
+            while starts[-1] + span < stop:
+                starts.append(starts[-1] + span)
+        if end is not None and start >= end:
+            return []
+        return list(zip(starts, starts[1:] + [end]))
+
+    @abstractmethod
+    def download(self, symbols: List[str], interval: str, period: Optional[str] = None,
+                 start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Return bars per symbol, normalized to lowercase OHLCV columns on a UTC index.
+        Either `period` or `start` (optionally `end`) bounds the request. Symbols
+        without data are omitted.
+        """
+
+
+class YahooProvider(MarketDataProvider):
+    """Yahoo Finance via yfinance; all symbols share one multi-ticker request."""
+
+    name = "yahoo"
+    interval_limits = YAHOO_INTERVAL_LIMITS
+    request_spans = YAHOO_REQUEST_SPANS
+    rate_limit = (YAHOO_REQUESTS_PER_SECOND, YAHOO_REQUEST_BURST)
+
+    def download(self, symbols: List[str], interval: str, period: Optional[str] = None,
+                 start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Download bars for one or more symbols in a single Yahoo request.
+        The (Ticker, Price) MultiIndex result is split into per-symbol frames by
+        column selection.
+        """
+        df = yf.download(tickers=symbols, interval=interval, period=period, start=start, end=end,
+                         group_by="ticker", progress=False)
+
+        if df is None or df.empty:
+            return {}
+
+        frames = {}
+        for symbol in symbols:
+            if isinstance(df.columns, pd.MultiIndex):
+                if symbol not in df.columns.get_level_values(0):
+                    continue
+                bars = df[symbol]
+            else:
+                # Older yfinance returns flat columns for a single ticker
+                bars = df
+
+            # Drop rows that only exist because another ticker traded then
+            bars = bars.dropna(how="all")
+            if bars.empty:
+                continue
+
+            frames[symbol] = _standardize_frame(bars)
+
+        return frames
+
+
+class FileReplayProvider(MarketDataProvider):
+    """
+    Replays bars from CSV or Parquet files at full speed, fully offline.
+    Files live in `root` as <SYMBOL>_<interval>.csv|.parquet (symbol made
+    filesystem-safe, e.g. GC_F_5m.csv) with a timestamp column or index plus
+    OHLCV columns. The replay clock is fixed at `as_of` (default: the newest bar
+    across all files), so runs are deterministic and never see future bars.
+    """
+
+    name = "replay"
+
+    def __init__(self, root: str = REPLAY_DATA_DIR, as_of: Optional[str] = REPLAY_AS_OF or None):
+        self.root = Path(root)
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._as_of = _to_utc(as_of) if as_of else None
+
+    def _file_key(self, symbol: str, interval: str) -> str:
+        return f"{safe_name(symbol)}_{interval}"
+
+    def _read(self, key: str) -> Optional[pd.DataFrame]:
+        """Read and cache one replay file."""
+        if key in self._frames:
+            return self._frames[key]
+
+        df = None
+        parquet_path, csv_path = self.root / f"{key}.parquet", self.root / f"{key}.csv"
+        try:
+            if parquet_path.exists():
+                df = pd.read_parquet(parquet_path)
+            elif csv_path.exists():
+                df = pd.read_csv(csv_path)
+        except ImportError as e:
+            logger.error(f"Cannot read {parquet_path}: {e}")
+
+        if df is not None and not df.empty:
+            time_col = next((c for c in df.columns if str(c).lower() in ("timestamp", "datetime", "date")), None)
+            if time_col is not None:
+                df = df.set_index(time_col)
+            df.index = pd.to_datetime(df.index, utc=True)
+            df = _standardize_frame(df.sort_index())
+
+        self._frames[key] = df
+        return df
+
+    def now(self) -> pd.Timestamp:
+        if self._as_of is not None:
+            return self._as_of
+
+        last_bars = [
+            df.index[-1] for df in (self._read(path.stem) for path in self.root.glob("*.*"))
+            if df is not None and not df.empty
+        ]
+        self._as_of = max(last_bars) if last_bars else pd.Timestamp.now(tz="UTC")
+        return self._as_of
+
+    def download(self, symbols: List[str], interval: str, period: Optional[str] = None,
+                 start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[str, pd.DataFrame]:
+        now = self.now()
+        # `end` is exclusive like Yahoo's, so adjacent chunks never share a bar; the clock is inclusive
+        end_ts = _to_utc(end) if end is not None and _to_utc(end) <= now else None
+
+        if start is not None:
+            start_ts = _to_utc(start)
+        else:
+            offset = period_to_offset(period)
+            start_ts = now - offset if offset is not None else None
+
+        frames = {}
+        for symbol in symbols:
+            df = self._read(self._file_key(symbol, interval))
+            if df is None:
+                logger.warning(f"No replay file for {symbol} {interval} in {self.root}")
+                continue
+
+            lo = df.index.searchsorted(start_ts, side="left") if start_ts is not None else 0
+            hi = (df.index.searchsorted(end_ts, side="left") if end_ts is not None
+                  else df.index.searchsorted(now, side="right"))
+            bars = df.iloc[lo:hi]
+            if not bars.empty:
+                frames[symbol] = bars.copy()
+
+        return frames
+
+
+def get_provider(name: str = MARKET_DATA_PROVIDER) -> MarketDataProvider:
+    """Build the market-data provider selected by name ("yahoo" or "replay")."""
+    if name == "replay":
+        return FileReplayProvider()
+    if name != "yahoo":
+        logger.warning(f"Unknown market data provider {name!r} - using Yahoo")
+    return YahooProvider()
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Iterator, Optional, Union
+from src.config import BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS, RETRY_MAX_DELAY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Monotonic time by which the current pipeline run must finish (None = no deadline)
+_run_deadline: ContextVar[Optional[float]] = ContextVar("run_deadline", default=None)
+
+Source = Union[str, Callable[..., str], None]
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose circuit breaker is open."""
+
+
+class DeadlineExceededError(Exception):
+    """Raised when the run deadline leaves no time for another attempt."""
+
+
+@contextmanager
+def run_deadline(seconds: float) -> Iterator[None]:
+    """Bound every retrying call made inside the block (including tasks it spawns) to `seconds`."""
+    token = _run_deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _run_deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the run deadline, or None when no deadline is set."""
+    deadline = _run_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def backoff_delay(attempt: int, base: float, cap: float = RETRY_MAX_DELAY_SECONDS) -> float:
+    """Exponential backoff with full jitter: uniform in [0, min(cap, base * 2^attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Per-source failure tracker.
+    After `failure_threshold` consecutive failures the circuit opens and calls fail
+    fast with CircuitOpenError. Once `reset_timeout` has passed one trial call is let
+    through (half-open) while every other call keeps failing fast; success closes the
+    circuit, failure re-opens it. A trial that never reports back (e.g. cancelled)
+    is abandoned after another `reset_timeout`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_started_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    @property
+    def trial_in_progress(self) -> bool:
+        return (self.trial_started_at is not None
+                and time.monotonic() - self.trial_started_at < self.reset_timeout)
+
+    def before_call(self):
+        state = self.state
+        if state == "open":
+            retry_in = self.reset_timeout - (time.monotonic() - self.opened_at)
+            raise CircuitOpenError(f"{self.name} circuit open (retry in {retry_in:.0f}s)")
+        if state == "half_open":
+            if self.trial_in_progress:
+                raise CircuitOpenError(f"{self.name} circuit half-open (trial call in progress)")
+            self.trial_started_at = time.monotonic()
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info(f"Circuit {self.name} closed")
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Circuit {self.name} opened after {self.failures} consecutive failures")
+            self.opened_at = time.monotonic()
+            self.trial_started_at = None
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Shared breaker for a source name, created on first use."""
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(name)
+    return _breakers[name]
+
+
+def _resolve_breaker(source: Source, args, kwargs) -> Optional[CircuitBreaker]:
+    if source is None:
+        return None
+    return get_breaker(source(*args, **kwargs) if callable(source) else source)
+
+
+def _next_delay(func_name: str, attempt: int, max_retries: int, delay: float, error: Exception) -> float:
+    """Backoff before the next attempt; raises when the run deadline cannot afford it."""
+    wait = backoff_delay(attempt, delay)
+    remaining = remaining_time()
+    if remaining is not None and wait >= remaining:
+        raise DeadlineExceededError(f"{func_name}: no time left to retry after {error}") from error
+    logger.warning(f"Attempt {attempt + 1}/{max_retries} failed for {func_name}: {error}. Retrying in {wait:.1f}s...")
+    return wait
+
+
+def retry_on_failure(max_retries: int = 3, delay: float = 1.0, source: Source = None):
+    """
+    Decorator for retrying async functions with jittered exponential backoff.
+    `source` names the upstream (or is a callable receiving the call's arguments that
+    returns the name); its circuit breaker short-circuits calls while the source is
+    down. Attempts and backoff sleeps never run past the active run_deadline.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            breaker = _resolve_breaker(source, args, kwargs)
+            for attempt in range(max_retries):
+                if breaker is not None:
+                    breaker.before_call()
+
+                remaining = remaining_time()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceededError(f"{func.__name__}: run deadline passed")
+
+                try:
+                    result = await asyncio.wait_for(func(*args, **kwargs), timeout=remaining)
+                except asyncio.TimeoutError as e:
+                    if breaker is not None:
+                        breaker.record_failure()
+                    raise DeadlineExceededError(f"{func.__name__}: run deadline passed mid-call") from e
+                except Exception as e:
+                    if breaker is not None:
+                        breaker.record_failure()
+                    if attempt == max_retries - 1:
+                        raise
+                    await asyncio.sleep(_next_delay(func.__name__, attempt, max_retries, delay, e))
+                    continue
+
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+            return None
+        return wrapper
+    return decorator
+
+
+def retry_on_failure_sync(max_retries: int = 3, delay: float = 1.0, source: Source = None):
+    """Blocking counterpart of retry_on_failure for synchronous clients (e.g. requests)."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            breaker = _resolve_breaker(source, args, kwargs)
+            for attempt in range(max_retries):
+                if breaker is not None:
+                    breaker.before_call()
+
+                remaining = remaining_time()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceededError(f"{func.__name__}: run deadline passed")
+
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    if breaker is not None:
+                        breaker.record_failure()
+                    if attempt == max_retries - 1:
+                        raise
+                    time.sleep(_next_delay(func.__name__, attempt, max_retries, delay, e))
+                    continue
+
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+            return None
+        return wrapper
+    return decorator
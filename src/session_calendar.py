@@ -0,0 +1,104 @@
+from datetime import date, datetime
+from typing import Tuple, Union
+from zoneinfo import ZoneInfo
+import numpy as np
+import pandas as pd
+
+ET_TZ = ZoneInfo("America/New_York")
+
+# CME Globex metals session: 18:00 ET (previous day) to 17:00 ET (session date)
+CME_SESSION_START_HOUR = 18
+CME_SESSION_END_HOUR = 17
+
+# Shifting the ET wall clock by 6h moves an 18:00 open onto midnight of the session date
+_SESSION_SHIFT_NS = np.int64(6 * 3600 * 10**9)
+_DAY_NS = np.int64(24 * 3600 * 10**9)
+
+DateLike = Union[date, datetime, pd.Timestamp, str]
+
+
+def session_bounds(session_date: DateLike) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """Return the (18:00 ET prev day, 17:00 ET) boundaries of the session ending on `session_date`."""
+    day = pd.Timestamp(pd.Timestamp(session_date).date())
+    start = day - pd.Timedelta(days=1) + pd.Timedelta(hours=CME_SESSION_START_HOUR)
+    end = day + pd.Timedelta(hours=CME_SESSION_END_HOUR)
+    return start.tz_localize(ET_TZ), end.tz_localize(ET_TZ)
+
+
+def session_labels(index: pd.DatetimeIndex) -> np.ndarray:
+    """Label each bar with its CME session date (datetime64[D]); bars from 18:00 ET belong to the next day."""
+    wall_ns = index.tz_convert(ET_TZ).tz_localize(None).as_unit("ns").asi8
+    return ((wall_ns + _SESSION_SHIFT_NS) // _DAY_NS).astype("datetime64[D]")
+
+
+class SessionIndex:
+    """
+    Sorted CME session boundaries aligned to a sorted bar index.
+    Built once in a single vectorized pass; afterwards any session or time
+    window resolves to a positional slice via searchsorted in O(log n).
+    """
+
+    def __init__(self, index: Union[pd.DatetimeIndex, np.ndarray]):
+        if isinstance(index, np.ndarray):
+            # int64 UTC nanoseconds, e.g. the timestamp column of a memory-mapped BarColumns
+            self._ns = index
+            index = pd.DatetimeIndex(index.view("datetime64[ns]")).tz_localize("UTC")
+        else:
+            if index.tz is None:
+                index = index.tz_localize("UTC")
+            self._ns = index.as_unit("ns").asi8
+
+        labels = session_labels(index)
+
+        # Positions where the session label changes mark session boundaries
+        boundaries = np.flatnonzero(labels[1:] != labels[:-1]) + 1
+        self.session_dates = labels[np.concatenate(([0], boundaries))] if len(labels) else labels
+        self.offsets = np.concatenate(([0], boundaries, [len(labels)])) if len(labels) else np.zeros(1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.session_dates)
+
+    def session_slice(self, session_date: DateLike) -> slice:
+        """Positional slice of the bars in the session ending on `session_date` (empty if absent)."""
+        target = np.datetime64(pd.Timestamp(session_date).date(), "D")
+        i = int(np.searchsorted(self.session_dates, target))
+
+        if i >= len(self.session_dates) or self.session_dates[i] != target:
+            return slice(0, 0)
+
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def window(self, start: pd.Timestamp, end: pd.Timestamp) -> slice:
+        """Positional slice of bars with start <= timestamp <= end."""
+        lo = int(np.searchsorted(self._ns, pd.Timestamp(start).value, side="left"))
+        hi = int(np.searchsorted(self._ns, pd.Timestamp(end).value, side="right"))
+        return slice(lo, hi)
+
+
+def session_date_for(ts: pd.Timestamp) -> date:
+    """CME session date of a single timestamp (scalar counterpart of session_labels)."""
+    ts = pd.Timestamp(ts)
+    if ts.tz is None:
+        ts = ts.tz_localize("UTC")
+    wall = ts.tz_convert(ET_TZ).tz_localize(None)
+    return (wall + pd.Timedelta(hours=24 - CME_SESSION_START_HOUR)).date()
+
+
+def last_completed_session(now: pd.Timestamp) -> date:
+    """Most recent weekday session that has closed by `now` (exchange holidays are not modelled)."""
+    now_et = pd.Timestamp(now).tz_convert(ET_TZ)
+    day = pd.Timestamp(now_et.date())
+    if now_et.hour < CME_SESSION_END_HOUR:
+        day -= pd.Timedelta(days=1)
+    return pd.offsets.BDay().rollback(day).date()
+
+
+def sessions_start(sessions: int, now: pd.Timestamp) -> pd.Timestamp:
+    """Open (18:00 ET) of the earliest of the last `sessions` completed sessions, in UTC."""
+    first = pd.Timestamp(last_completed_session(now)) - pd.offsets.BDay(max(1, sessions) - 1)
+    return session_bounds(first)[0].tz_convert("UTC")
+
+
+def session_start_for(ts: pd.Timestamp) -> pd.Timestamp:
+    """Open (18:00 ET) of the session containing `ts`, in UTC."""
+    return session_bounds(session_date_for(ts))[0].tz_convert("UTC")
@@ -0,0 +1,297 @@
+import logging
+import os
+from collections import deque
+from datetime import date
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.bar_store import safe_name
+from src.config import VALUE_AREA_FRACTION
+from src.session_calendar import SessionIndex, session_bounds
+
+logger = logging.getLogger(__name__)
+
+# Reported prices are rounded to drop float residue from the grid arithmetic (e.g. 2028.1000000000001)
+PRICE_DECIMALS = 8
+# Composite tick volumes below this fraction of the peak are treated as empty
+COMPOSITE_RESIDUE = 1e-9
+
+
+class VolumeProfile:
+    """
+    Traded volume on a regular price grid: bin k covers
+    (low + k * bin_size, low + (k + 1) * bin_size] and is reported at its midpoint.
+    """
+
+    def __init__(self, volumes: np.ndarray, low: float, bin_size: float):
+        self.volumes = np.asarray(volumes, dtype=np.float64)
+        self.low = float(low)
+        self.bin_size = float(bin_size)
+
+    def __len__(self) -> int:
+        return len(self.volumes)
+
+    def price_at(self, index):
+        """Midpoint price of bin `index` (an int or an index array)."""
+        return np.round(self.low + (np.asarray(index) + 0.5) * self.bin_size, PRICE_DECIMALS)
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self.price_at(np.arange(len(self.volumes)))
+
+    @property
+    def total_volume(self) -> float:
+        return float(self.volumes.sum())
+
+    @property
+    def poc_index(self) -> int:
+        """Bin with the most volume (the lowest such bin on ties)."""
+        return int(np.argmax(self.volumes))
+
+    @property
+    def vpoc(self) -> float:
+        return float(self.price_at(self.poc_index))
+
+    @property
+    def max_volume(self) -> float:
+        return float(self.volumes.max())
+
+    def value_area(self, fraction: float = VALUE_AREA_FRACTION) -> Tuple[float, float]:
+        """(VAL, VAH): prices of the lowest and highest bins in the value area."""
+        lo, hi = value_area_bounds(self.volumes, self.poc_index, fraction)
+        return float(self.price_at(lo)), float(self.price_at(hi))
+
+
+def value_area_bounds(volumes: np.ndarray, poc: int, fraction: float = VALUE_AREA_FRACTION) -> Tuple[int, int]:
+    """
+    First and last bin of the value area, built outwards from the POC: each step
+    compares the volume of the next two bins above with the next two below and
+    takes the larger pair (above on ties) until `fraction` of all volume is covered.
+    Pair sums come from one cumulative sum, so the walk is linear in the bin count.
+    """
+    n = len(volumes)
+    cumulative = np.concatenate(([0.0], np.cumsum(volumes))).tolist()
+    target = fraction * cumulative[-1]
+    lo = hi = poc
+    covered = cumulative[poc + 1] - cumulative[poc]
+
+    while covered < target and (lo > 0 or hi < n - 1):
+        above = cumulative[min(hi + 3, n)] - cumulative[hi + 1]
+        below = cumulative[lo] - cumulative[max(lo - 2, 0)]
+        if hi < n - 1 and (lo == 0 or above >= below):
+            hi = min(hi + 2, n - 1)
+            covered += above
+        else:
+            lo = max(lo - 2, 0)
+            covered += below
+    return lo, hi
+
+
+def histogram_profile(close: np.ndarray, volume: np.ndarray, bins: int = 50) -> VolumeProfile:
+    """
+    Volume at close price in `bins` equal-width bins spanning the closes. Bins are
+    right-closed with the lowest close in the first bin, as with pd.cut(include_lowest=True);
+    bin indices come from one searchsorted over the same linspace edges pd.cut uses,
+    and volumes from one bincount.
+    Bars with a missing close are skipped; missing volume counts as zero.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    valid = np.isfinite(close)
+    close, volume = close[valid], np.nan_to_num(volume[valid])
+
+    if len(close) == 0:
+        return VolumeProfile(np.zeros(0), np.nan, np.nan)
+
+    price_min, price_max = close.min(), close.max()
+    bin_size = (price_max - price_min) / bins
+    if bin_size == 0:
+        return VolumeProfile(np.array([volume.sum()]), price_min, 0.0)
+
+    edges = np.linspace(price_min, price_max, bins + 1)
+    index = np.clip(np.searchsorted(edges, close, side="left") - 1, 0, bins - 1)
+    return VolumeProfile(np.bincount(index, weights=volume, minlength=bins), price_min, bin_size)
+
+
+def _tick_histogram(high: np.ndarray, low: np.ndarray, volume: np.ndarray,
+                    tick_size: float) -> Tuple[int, np.ndarray]:
+    """(first tick, volume per tick) with each bar's volume spread evenly from its low tick to its high tick."""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    valid = np.isfinite(high) & np.isfinite(low)
+    high, low, volume = high[valid], low[valid], np.nan_to_num(volume[valid])
+
+    if len(high) == 0:
+        return 0, np.zeros(0)
+
+    low_tick = np.rint(np.minimum(low, high) / tick_size).astype(np.int64)
+    high_tick = np.rint(np.maximum(low, high) / tick_size).astype(np.int64)
+    first = int(low_tick.min())
+    ticks = int(high_tick.max()) - first + 1
+
+    share = volume / (high_tick - low_tick + 1)
+    delta = (np.bincount(low_tick - first, weights=share, minlength=ticks + 1)
+             - np.bincount(high_tick - first + 1, weights=share, minlength=ticks + 1))
+    return first, np.maximum(np.cumsum(delta[:ticks]), 0.0)  # clip float residue below zero
+
+
+def tick_profile(high: np.ndarray, low: np.ndarray, volume: np.ndarray, tick_size: float) -> VolumeProfile:
+    """
+    Volume per tick, with each bar's volume spread evenly over every tick from its low
+    to its high. Bars become difference-array entries (+share at the low tick,
+    -share one past the high tick), accumulated by two bincounts and a cumulative sum,
+    so the cost is linear in bars plus ticks. Bin k is centred on tick (first + k).
+    Bars with a missing high or low are skipped; missing volume counts as zero.
+    """
+    first, volumes = _tick_histogram(high, low, volume, tick_size)
+    if len(volumes) == 0:
+        return VolumeProfile(volumes, np.nan, tick_size)
+    return VolumeProfile(volumes, (first - 0.5) * tick_size, tick_size)
+
+
+def session_tick_histograms(bars: pd.DataFrame, tick_size: float, through: Optional[date] = None,
+                            start: Optional[pd.Timestamp] = None) -> Dict[date, Tuple[int, np.ndarray]]:
+    """
+    Tick histogram of every CME session in `bars` (up to and including `through`),
+    keyed by session date, each as (first tick, volume per tick) on the absolute
+    tick grid where tick k is price k * tick_size. Sessions opening before `start`
+    (the beginning of the fetched bars) are only partly covered and are skipped.
+    """
+    if bars is None or bars.empty:
+        return {}
+
+    bars = bars.sort_index()
+    sessions = SessionIndex(bars.index)
+    high = bars["high"].to_numpy() if "high" in bars.columns else bars["close"].to_numpy()
+    low = bars["low"].to_numpy() if "low" in bars.columns else bars["close"].to_numpy()
+    volume = bars["volume"].to_numpy()
+
+    histograms = {}
+    for i, session_date in enumerate(sessions.session_dates.astype(object)):
+        if through is not None and session_date > through:
+            break
+        if start is not None and session_bounds(session_date)[0] < start:
+            continue
+        lo, hi = int(sessions.offsets[i]), int(sessions.offsets[i + 1])
+        first, volumes = _tick_histogram(high[lo:hi], low[lo:hi], volume[lo:hi], tick_size)
+        if len(volumes):
+            histograms[session_date] = (first, volumes)
+    return histograms
+
+
+class SessionProfileStore:
+    """
+    Persistent per-session tick histograms, one .npz file per symbol and tick size:
+    session dates, each session's first tick, and all histograms concatenated with
+    offsets. Histograms of completed sessions never change, so a run only adds the
+    sessions it has not seen.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, symbol: str, tick_size: float) -> Path:
+        return self.root / f"{safe_name(symbol)}_{tick_size:g}.npz"
+
+    def load(self, symbol: str, tick_size: float) -> Dict[date, Tuple[int, np.ndarray]]:
+        path = self._path(symbol, tick_size)
+        if not path.exists():
+            return {}
+        try:
+            with np.load(path) as data:
+                dates, first_ticks = data["dates"].astype(object), data["first_ticks"]
+                offsets, volumes = data["offsets"], data["volumes"]
+        except Exception as e:
+            logger.warning(f"Profile store {path} unreadable ({e}) - ignoring")
+            return {}
+        return {
+            session_date: (int(first_ticks[i]), volumes[offsets[i]:offsets[i + 1]])
+            for i, session_date in enumerate(dates)
+        }
+
+    def save(self, symbol: str, tick_size: float, histograms: Dict[date, Tuple[int, np.ndarray]]):
+        dates = sorted(histograms)
+        arrays = [histograms[d][1] for d in dates]
+        path = self._path(symbol, tick_size)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                dates=np.array(dates, dtype="datetime64[D]"),
+                first_ticks=np.array([histograms[d][0] for d in dates], dtype=np.int64),
+                offsets=np.concatenate(([0], np.cumsum([len(v) for v in arrays]))).astype(np.int64),
+                volumes=np.concatenate(arrays) if arrays else np.zeros(0),
+            )
+        os.replace(tmp_path, path)
+
+
+class CompositeProfile:
+    """
+    Running sum of the last `sessions` session histograms on the absolute tick grid.
+    Adding the newest session and subtracting the one leaving the window each touch
+    only that session's ticks, so advancing a composite by a day costs one histogram
+    instead of a rebuild from bars. The sum is recomputed from the held sessions every
+    `sessions` updates to stop float drift.
+    """
+
+    def __init__(self, sessions: int, tick_size: float):
+        self.sessions = max(1, sessions)
+        self.tick_size = tick_size
+        self._members: Deque[Tuple[date, int, np.ndarray]] = deque()
+        self._first = 0
+        self._volumes = np.zeros(0)
+        self._updates_since_resync = 0
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    @property
+    def first_session(self) -> Optional[date]:
+        return self._members[0][0] if self._members else None
+
+    @property
+    def last_session(self) -> Optional[date]:
+        return self._members[-1][0] if self._members else None
+
+    def _accumulate(self, first: int, volumes: np.ndarray, sign: float):
+        if len(self._volumes) == 0:
+            self._first, self._volumes = first, np.zeros(len(volumes))
+        lo, hi = min(self._first, first), max(self._first + len(self._volumes), first + len(volumes))
+        if lo < self._first or hi > self._first + len(self._volumes):
+            # Widen the grid to cover a session trading outside it
+            self._volumes = np.pad(self._volumes, (self._first - lo, hi - self._first - len(self._volumes)))
+            self._first = lo
+        self._volumes[first - self._first:first - self._first + len(volumes)] += sign * volumes
+
+    def _resync(self):
+        self._volumes = np.zeros(0)
+        for _, first, volumes in self._members:
+            self._accumulate(first, volumes, 1.0)
+        self._updates_since_resync = 0
+
+    def add(self, session_date: date, first: int, volumes: np.ndarray):
+        """Add a session newer than the last one held, dropping the oldest beyond the window."""
+        if self._members and session_date <= self._members[-1][0]:
+            return
+        self._members.append((session_date, first, volumes))
+        self._accumulate(first, volumes, 1.0)
+        if len(self._members) > self.sessions:
+            _, old_first, old_volumes = self._members.popleft()
+            self._accumulate(old_first, old_volumes, -1.0)
+
+        self._updates_since_resync += 1
+        if self._updates_since_resync >= self.sessions:
+            self._resync()
+
+    def profile(self) -> VolumeProfile:
+        """The composite as a VolumeProfile, trimmed to the ticks that traded."""
+        # Subtracting a session leaves float residue on ticks only it traded
+        volumes = np.where(self._volumes > COMPOSITE_RESIDUE * self._volumes.max(initial=0.0), self._volumes, 0.0)
+        traded = np.flatnonzero(volumes > 0)
+        if len(traded) == 0:
+            return VolumeProfile(np.zeros(0), np.nan, self.tick_size)
+        lo, hi = traded[0], traded[-1] + 1
+        return VolumeProfile(volumes[lo:hi], (self._first + lo - 0.5) * self.tick_size, self.tick_size)